@@ -0,0 +1,132 @@
+"""Shared asset cache module"""
+import os
+
+import pygame
+
+
+class RotationTable:
+    """Pre-rotated copies of one image, quantized into angle buckets"""
+
+    def __init__(self, image, steps, base_angle=0):
+        self.steps = steps
+        self.step_deg = 360 / steps
+        self.surfaces = []
+        self.offsets = []
+        for index in range(steps):
+            rotated = pygame.transform.rotate(image, -index * self.step_deg + base_angle)
+            self.surfaces.append(rotated)
+            self.offsets.append((rotated.get_width() // 2, rotated.get_height() // 2))
+
+    def index(self, angle_deg):
+        """Bucket index for an angle in degrees"""
+        return round(angle_deg / self.step_deg) % self.steps
+
+    def get(self, angle_deg):
+        """Pre-rotated Surface and its center offset for an angle"""
+        index = self.index(angle_deg)
+        return self.surfaces[index], self.offsets[index]
+
+
+def scale_image(image, size=None, scale=1.0):
+    """image resized to size or by scale, image itself when neither applies"""
+    if size is not None:
+        return pygame.transform.scale(image, size)
+    if scale != 1.0:
+        width, height = image.get_size()
+        return pygame.transform.scale(image, (int(width * scale), int(height * scale)))
+    return image
+
+
+def cut_grid(sheet, cols, rows, scale=1.0):
+    """Sprite sheet Surface cut into grid[row][col] frames, scaled by scale"""
+    frame_width = sheet.get_width() // cols
+    frame_height = sheet.get_height() // rows
+
+    grid = []
+    for row in range(rows):
+        row_frames = []
+        for col in range(cols):
+            area = (col * frame_width, row * frame_height, frame_width, frame_height)
+            frame = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
+            frame.blit(sheet, (0, 0), area)
+            row_frames.append(scale_image(frame, scale=scale))
+        grid.append(row_frames)
+    return grid
+
+
+class AssetCache:
+    """Process-wide registry of decoded, converted and scaled Surfaces.
+
+    Every entry is decoded and scaled exactly once and then shared by all
+    callers, so returned Surfaces and grids must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._store = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, loader):
+        """Returns cached value for key, calling loader() on first request"""
+        try:
+            value = self._store[key]
+        except KeyError:
+            self.misses += 1
+            value = loader()
+            self._store[key] = value
+            return value
+        self.hits += 1
+        return value
+
+    def __contains__(self, key):
+        return key in self._store
+
+    def put(self, key, value):
+        """Stores an already prepared value under key"""
+        self._store[key] = value
+
+    def image(self, path, size=None, scale=1.0, alpha=True):
+        """Loaded image, converted for display and optionally resized"""
+        path = os.path.normpath(path)
+        key = ("image", path, size, scale, alpha)
+        return self.get(key, lambda: self._load_image(path, size, scale, alpha))
+
+    def grid(self, path, cols, rows, scale=1.0):
+        """Sprite sheet cut into grid[row][col] frames, scaled by scale"""
+        path = os.path.normpath(path)
+        key = ("grid", path, cols, rows, scale)
+        return self.get(key, lambda: self._load_grid(path, cols, rows, scale))
+
+    def rotations(self, path, steps, size=None, base_angle=0):
+        """RotationTable of a loaded image with steps angle buckets"""
+        path = os.path.normpath(path)
+        key = ("rotations", path, size, steps, base_angle)
+        return self.get(key, lambda: RotationTable(self.image(path, size=size), steps, base_angle))
+
+    def invalidate(self, path=None):
+        """Drops cached entries of one source file (or all), returns count"""
+        if path is None:
+            count = len(self._store)
+            self._store.clear()
+            return count
+
+        path = os.path.normpath(path)
+        stale = [key for key in self._store if key[1] == path]
+        for key in stale:
+            del self._store[key]
+        return len(stale)
+
+    def stats(self):
+        """Hit / miss counters and number of cached entries"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._store)}
+
+    def _load_image(self, path, size, scale, alpha):
+        image = pygame.image.load(path)
+        image = image.convert_alpha() if alpha else image.convert()
+        return scale_image(image, size, scale)
+
+    def _load_grid(self, path, cols, rows, scale):
+        return cut_grid(self.image(path), cols, rows, scale)
+
+
+ASSET_CACHE = AssetCache()
@@ -1,13 +1,44 @@
-import pygame
 from spritesheet import SpriteSheet
+from asset_cache import ASSET_CACHE
+from config import BULLET_ROTATION_STEPS, MAX_SPRITES
 import os
 
+UNICORN_BULLET_PATH = os.path.join("assets", "sprites", "bullets", "unicorn_bullet.png")
+
+
+def load_unicorn_bullet():
+    """Shared, pre-scaled unicorn bullet image or None if it cannot be loaded"""
+    try:
+        return ASSET_CACHE.image(UNICORN_BULLET_PATH, size=(32, 32))
+    except Exception as e:
+        print(f"[ERROR] Could not load unicorn bullet: {e}")
+        return None
+
+
+def load_unicorn_bullet_rotations():
+    """Shared rotation table of the unicorn bullet, None when disabled or missing"""
+    if not BULLET_ROTATION_STEPS:
+        return None
+    # Network snapshots send the bucket of every bullet as one byte
+    if BULLET_ROTATION_STEPS > MAX_SPRITES:
+        raise ValueError(f"BULLET_ROTATION_STEPS must be at most {MAX_SPRITES}")
+    try:
+        # Bullet sprite points left, hence the 180° base angle
+        return ASSET_CACHE.rotations(
+            UNICORN_BULLET_PATH, BULLET_ROTATION_STEPS, size=(32, 32), base_angle=180
+        )
+    except Exception as e:
+        print(f"[ERROR] Could not load unicorn bullet: {e}")
+        return None
+
+
 class Assets:
     def __init__(self):
         self.player_frames = {}
         self.load_player_frames()
 
         self.unicorn_bullet = self.load_unicorn_bullet()  # Preload unicorn bullet
+        self.unicorn_bullet_rotations = load_unicorn_bullet_rotations()
 
     def load_player_frames(self):
         sprite_path = os.path.join("assets", "sprites", "characters", "Player.png")
@@ -27,13 +58,5 @@ class Assets:
                 self.player_frames[key] = [frame]
 
     def load_unicorn_bullet(self):
-        path = os.path.join("assets", "sprites", "bullets", "unicorn_bullet.png")
-        try:
-            image = pygame.image.load(path).convert_alpha()
-            scaled = pygame.transform.scale(image, (32, 32))
-            #print("[DEBUG] Unicorn bullet loaded:", scaled.get_size())
-            return scaled
-        except Exception as e:
-            print(f"[ERROR] Could not load unicorn bullet: {e}")
-            return None
+        return load_unicorn_bullet()
 
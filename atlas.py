@@ -0,0 +1,295 @@
+"""Pre-baked texture atlas module
+
+Packs every scaled frame the game requests from ASSET_CACHE into a single
+raw pixel file plus a JSON index. Startup memory-maps the pixels and hands
+the cache subsurfaces of it, so no PNG is decoded or scaled. The index keys
+the atlas by the mtime, size and SHA-1 of every source PNG and the atlas is
+rebuilt automatically when one of them changes.
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import time
+
+import pygame
+
+from asset_cache import ASSET_CACHE, cut_grid, scale_image
+from config import ATLAS_ENABLED, ATLAS_CACHE_DIR, SCREEN_WIDTH, SCREEN_HEIGHT
+
+ATLAS_VERSION = 1
+PIXEL_FORMAT = "BGRA"  # byte order of convert_alpha() Surfaces on little-endian displays
+PIXEL_FILE = "atlas.bgra"
+INDEX_FILE = "atlas.json"
+MIN_WIDTH = 1024
+
+SPRITES = os.path.join("assets", "sprites")
+
+# Baked ASSET_CACHE keys, they must match the calls in assets.py,
+# enemy_unicorns.py, game.py and ui.py to be picked up
+ATLAS_ENTRIES = (
+    ("grid", os.path.join(SPRITES, "characters", "Player.png"), 5, 4, 0.4),
+    ("grid", os.path.join(SPRITES, "characters", "Unicorn.png"), 5, 4, 0.3),
+    ("image", os.path.join(SPRITES, "bullets", "unicorn_bullet.png"), (32, 32), 1.0, True),
+    ("image", os.path.join(SPRITES, "background", "heli.png"),
+     (SCREEN_WIDTH, SCREEN_HEIGHT), 1.0, False),
+    ("image", os.path.join(SPRITES, "background", "intro.png"),
+     (SCREEN_WIDTH, SCREEN_HEIGHT), 1.0, False),
+)
+
+_installed = None  # atlas handed to ASSET_CACHE, keeps the pixel mapping alive
+
+
+def entry_key(entry):
+    """ASSET_CACHE key of an atlas entry"""
+    return (entry[0], os.path.normpath(entry[1])) + tuple(entry[2:])
+
+
+def _tuples(value):
+    """JSON lists back into the tuples used by cache keys"""
+    if isinstance(value, list):
+        return tuple(_tuples(item) for item in value)
+    return value
+
+
+def file_hash(path):
+    """SHA-1 hex digest of a file"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_key(path):
+    """[mtime_ns, size, sha1] of a source file"""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size, file_hash(path)]
+
+
+def render_entry(entry):
+    """Surfaces of one entry, a flat list of frames in row-major order"""
+    kind, path = entry[0], entry[1]
+    # Left unconverted, building needs no display
+    image = pygame.image.load(path)
+    if kind == "grid":
+        _, _, cols, rows, scale = entry
+        return [frame for row in cut_grid(image, cols, rows, scale) for frame in row]
+    _, _, size, scale, _ = entry
+    return [scale_image(image, size, scale)]
+
+
+def pack(sizes, min_width=MIN_WIDTH):
+    """Shelf packing of (width, height) sizes, returns (atlas size, positions)"""
+    width = max([min_width] + [w for w, _ in sizes])
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    shelves = []  # [y, height, used width]
+    positions = [None] * len(sizes)
+    height = 0
+    for index in order:
+        w, h = sizes[index]
+        shelf = next((s for s in shelves if h <= s[1] and s[2] + w <= width), None)
+        if shelf is None:
+            shelf = [height, h, 0]
+            shelves.append(shelf)
+            height += h
+        positions[index] = (shelf[2], shelf[0])
+        shelf[2] += w
+    return (width, height), positions
+
+
+def build_atlas(entries=ATLAS_ENTRIES, cache_dir=ATLAS_CACHE_DIR, frames=None):
+    """Renders, packs and writes the atlas pixels and index, returns the index.
+
+    frames takes the render_entry() results of entries when already rendered.
+    """
+    entries = [entry_key(entry) for entry in entries]
+    if frames is None:
+        frames = [render_entry(entry) for entry in entries]
+    flat = [frame for entry_frames in frames for frame in entry_frames]
+    size, positions = pack([frame.get_size() for frame in flat])
+
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    for frame, pos in zip(flat, positions):
+        # Max against the zeroed atlas copies pixels, alpha included, without blending
+        surface.blit(frame, pos, special_flags=pygame.BLEND_RGBA_MAX)
+
+    rects = iter([list(pos) + list(frame.get_size()) for frame, pos in zip(flat, positions)])
+    index = {
+        "version": ATLAS_VERSION,
+        "format": PIXEL_FORMAT,
+        "size": list(size),
+        "sources": {path: source_key(path) for path in sorted({entry[1] for entry in entries})},
+        "entries": [{"key": list(entry), "rects": [next(rects) for _ in entry_frames]}
+                    for entry, entry_frames in zip(entries, frames)],
+    }
+
+    os.makedirs(cache_dir, exist_ok=True)
+    pixel_path = os.path.join(cache_dir, PIXEL_FILE)
+    index_path = os.path.join(cache_dir, INDEX_FILE)
+    # Per-process temporary names, parallel workers may build at the same time
+    temp_path = f"{pixel_path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(pygame.image.tobytes(surface, PIXEL_FORMAT))
+    os.replace(temp_path, pixel_path)
+    _write_index(index, index_path)
+    return index
+
+
+def _write_index(index, index_path):
+    temp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(temp_path, index_path)
+
+
+def _well_formed(index):
+    """index has every field the atlas reads, in the shape build_atlas writes"""
+    if not isinstance(index, dict):
+        return False
+    entries, sources, size = index.get("entries"), index.get("sources"), index.get("size")
+    return (isinstance(entries, list) and isinstance(sources, dict)
+            and isinstance(size, list) and len(size) == 2
+            and all(isinstance(entry, dict) and isinstance(entry.get("rects"), list)
+                    and "key" in entry for entry in entries)
+            and all(isinstance(stamp, list) and len(stamp) == 3 for stamp in sources.values()))
+
+
+def read_index(entries=ATLAS_ENTRIES, cache_dir=ATLAS_CACHE_DIR):
+    """Index of a cached atlas still matching entries and sources, otherwise None.
+
+    Sources whose mtime changed but whose hash did not are re-stamped in the
+    index, so the next start only compares mtimes again.
+    """
+    index_path = os.path.join(cache_dir, INDEX_FILE)
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    expected = [entry_key(entry) for entry in entries]
+    if (not _well_formed(index) or index.get("version") != ATLAS_VERSION
+            or index.get("format") != PIXEL_FORMAT
+            or [_tuples(entry["key"]) for entry in index["entries"]] != expected):
+        return None
+
+    restamped = False
+    for path, (mtime_ns, size, digest) in index["sources"].items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+            continue
+        if stat.st_size != size or file_hash(path) != digest:
+            return None
+        index["sources"][path] = [stat.st_mtime_ns, size, digest]
+        restamped = True
+
+    if restamped:
+        try:
+            _write_index(index, index_path)
+        except OSError:
+            pass
+    return index
+
+
+class TextureAtlas:
+    """Memory-mapped atlas pixels and the cache entries cut out of them"""
+
+    def __init__(self, index, cache_dir=ATLAS_CACHE_DIR):
+        self.index = index
+        width, height = index["size"]
+        with open(os.path.join(cache_dir, PIXEL_FILE), "rb") as f:
+            # Copy-on-write mapping, a stray write to a shared frame never reaches the file
+            self.pixels = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(self.pixels) != width * height * 4:
+            self.pixels.close()
+            raise ValueError("Atlas pixel file does not match its index")
+        self.surface = pygame.image.frombuffer(self.pixels, (width, height), PIXEL_FORMAT)
+
+        # Displays with another pixel layout get one converted copy instead of the mapping
+        if pygame.display.get_surface() is not None:
+            probe = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+            if probe.get_masks() != self.surface.get_masks():
+                self.surface = self.surface.convert_alpha()
+
+    def frames(self, rects):
+        """Subsurfaces of the atlas"""
+        return [self.surface.subsurface(rect) for rect in rects]
+
+    def items(self):
+        """(cache key, value) of every entry, values as ASSET_CACHE.image / grid return them"""
+        display = pygame.display.get_surface() is not None
+        for entry in self.index["entries"]:
+            key = _tuples(entry["key"])
+            frames = self.frames(entry["rects"])
+            if key[0] == "grid":
+                cols, rows = key[2], key[3]
+                yield key, [frames[row * cols:(row + 1) * cols] for row in range(rows)]
+            elif not key[4] and display:
+                # Opaque copy, blits faster than a per-pixel alpha view
+                yield key, frames[0].convert()
+            else:
+                yield key, frames[0]
+
+
+def load_atlas(entries=ATLAS_ENTRIES, cache_dir=ATLAS_CACHE_DIR, rebuild=True):
+    """TextureAtlas of entries, (re)built when missing or stale, None on failure"""
+    try:
+        index = read_index(entries, cache_dir)
+        if index is None:
+            if not rebuild:
+                return None
+            index = build_atlas(entries, cache_dir)
+        return TextureAtlas(index, cache_dir)
+    except (OSError, ValueError, pygame.error) as e:
+        print(f"[WARN] Texture atlas unavailable, loading PNGs instead: {e}")
+        return None
+
+
+def install_atlas(cache=ASSET_CACHE, enabled=ATLAS_ENABLED, cache_dir=ATLAS_CACHE_DIR,
+                  rebuild=True):
+    """Puts every atlas entry into cache once per process, call after the display is set up.
+
+    Returns True when the atlas is in use. Keys missing from the atlas keep
+    loading from their PNGs as before. Without rebuild a stale atlas is left
+    for someone else to rebuild, e.g. the AssetPreloader.
+    """
+    global _installed  # pylint: disable=global-statement
+    if _installed is not None:
+        return True
+    if not enabled:
+        return False
+    atlas = load_atlas(cache_dir=cache_dir, rebuild=rebuild)
+    if atlas is None:
+        return False
+    for key, value in atlas.items():
+        cache.put(key, value)
+    _installed = atlas
+    return True
+
+
+def main():
+    """Atlas build CLI"""
+    parser = argparse.ArgumentParser(description="Builds the pre-baked texture atlas")
+    parser.add_argument("--cache-dir", default=ATLAS_CACHE_DIR)
+    parser.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = None if args.force else read_index(cache_dir=args.cache_dir)
+    state = "up to date"
+    if index is None:
+        index = build_atlas(cache_dir=args.cache_dir)
+        state = "built"
+    width, height = index["size"]
+    frames = sum(len(entry["rects"]) for entry in index["entries"])
+    print(f"Atlas {state}: {width}x{height}, {frames} frames from {len(index['sources'])} "
+          f"PNGs in {(time.perf_counter() - start) * 1e3:.0f} ms -> {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
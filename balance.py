@@ -0,0 +1,207 @@
+"""Batch balancing simulator module
+
+Plays many headless bot matches for every point of a parameter grid across a
+process pool and reports win rate, score and survival time per point.
+
+    python balance.py --matches 500 \\
+        --grid npc_shoot_cooldown=300,500 spawn_interval_range=2000:4000,3000:5000 \\
+        --grid UnicornEnemy.damage=6,8,10 win_score=150,200 --csv report.csv
+"""
+import argparse
+import concurrent.futures
+import csv
+import itertools
+import json
+import os
+import statistics
+import time
+
+from config import GAME_FPS
+from enemy_unicorns import UnicornEnemy
+from headless import BotGame, HeadlessRunner, RandomBot
+from player import Player
+
+# Parameters named "<Class>.<attribute>" patch stats of these classes
+STAT_CLASSES = {cls.__name__: cls for cls in (UnicornEnemy, Player)}
+ENEMY_CLASSES = {cls.__name__: cls for cls in (UnicornEnemy,)}
+GAME_PARAMS = ("spawn_interval_range", "npc_shoot_cooldown", "spawn_order", "win_score")
+
+
+def parse_value(text):
+    """JSON value, "a:b" pair or plain string of one grid value"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    if ":" in text:
+        return tuple(parse_value(part) for part in text.split(":"))
+    return text
+
+
+def parse_grid(specs):
+    """List of parameter dicts, the cartesian product of "name=v1,v2" specs.
+
+    Values holding commas, like spawn_order lists, go as JSON in their own
+    spec: spawn_order='[[0, 9999, ["UnicornEnemy"]]]'.
+    """
+    axes = []
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not values:
+            raise ValueError(f"Grid spec {spec!r} is not name=values")
+        if values.lstrip().startswith("["):
+            options = [json.loads(values)]
+        else:
+            options = [parse_value(value) for value in values.split(",")]
+        if name not in GAME_PARAMS and name.partition(".")[0] not in STAT_CLASSES:
+            raise ValueError(f"Unknown parameter {name}")
+        axes.append([(name, value) for value in options])
+    return [dict(point) for point in itertools.product(*axes)]
+
+
+def game_kwargs(params):
+    """AbstractGame kwargs of the game parameters in params"""
+    kwargs = {name: value for name, value in params.items() if name in GAME_PARAMS}
+    if "spawn_order" in kwargs:
+        kwargs["spawn_order"] = [(low, high, [ENEMY_CLASSES[name] for name in names])
+                                 for low, high, names in kwargs["spawn_order"]]
+    return kwargs
+
+
+def patch_stats(params):
+    """Applies "<Class>.<attribute>" params, returns what to restore"""
+    saved = []
+    for name, value in params.items():
+        cls_name, _, attribute = name.partition(".")
+        if attribute:
+            cls = STAT_CLASSES[cls_name]
+            saved.append((cls, attribute, cls.__dict__.get(attribute, getattr(cls, attribute))))
+            setattr(cls, attribute, value)
+    return saved
+
+
+def play_match(params, seed, players, max_ticks):
+    """Result, score and survival time of one bot match"""
+    runner = HeadlessRunner(BotGame, input_source=RandomBot(seed), player_count=players,
+                            seed=seed, **game_kwargs(params))
+    runner.step(max_ticks)
+    game = runner.game
+    return {
+        "result": game.game_result or "timeout",
+        "score": game.score,
+        "survival_s": runner.tick * runner.dt / 1000,
+    }
+
+
+def run_batch(point, params, seeds, players, max_ticks):
+    """Plays one match per seed for one grid point, runs inside a worker process"""
+    saved = patch_stats(params)
+    start = time.process_time()
+    try:
+        matches = [play_match(params, seed, players, max_ticks) for seed in seeds]
+    finally:
+        for cls, attribute, value in saved:
+            setattr(cls, attribute, value)
+    return point, matches, time.process_time() - start
+
+
+def summarize(params, matches):
+    """Win rate plus score and survival distributions of one grid point"""
+    scores = sorted(match["score"] for match in matches)
+    survival = sorted(match["survival_s"] for match in matches)
+    count = len(matches)
+    row = {name: json.dumps(value) if isinstance(value, (list, tuple)) else value
+           for name, value in params.items()}
+    row.update({
+        "matches": count,
+        "win_rate": sum(match["result"] == "win" for match in matches) / count,
+        "timeout_rate": sum(match["result"] == "timeout" for match in matches) / count,
+        "score_mean": statistics.fmean(scores),
+        "score_p10": scores[count // 10],
+        "score_p50": scores[count // 2],
+        "score_p90": scores[min(count - 1, count * 9 // 10)],
+        "survival_mean_s": statistics.fmean(survival),
+        "survival_p10_s": survival[count // 10],
+        "survival_p50_s": survival[count // 2],
+        "survival_p90_s": survival[min(count - 1, count * 9 // 10)],
+    })
+    return row
+
+
+def run_grid(grid, matches, workers, players=1, max_ticks=GAME_FPS * 600, batch=25, seed=0):
+    """Runs matches per grid point over a process pool, returns (rows, throughput)"""
+    results = {point: [] for point in range(len(grid))}
+    cpu_seconds = 0.0
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = []
+        for point, params in enumerate(grid):
+            seeds = range(seed, seed + matches)
+            for offset in range(0, matches, batch):
+                futures.append(pool.submit(run_batch, point, params, seeds[offset:offset + batch],
+                                           players, max_ticks))
+        for future in concurrent.futures.as_completed(futures):
+            point, batch_matches, cpu = future.result()
+            results[point].extend(batch_matches)
+            cpu_seconds += cpu
+    wall = time.perf_counter() - start
+
+    total = len(grid) * matches
+    throughput = {
+        "matches": total,
+        "workers": workers,
+        "wall_s": wall,
+        "matches_per_s": total / wall,
+        "matches_per_s_per_core": total / wall / workers,
+        "matches_per_cpu_s": total / cpu_seconds if cpu_seconds else 0.0,
+    }
+    rows = [summarize(params, results[point]) for point, params in enumerate(grid)]
+    return rows, throughput
+
+
+def write_csv(path, rows):
+    """One CSV line per grid point"""
+    fields = list(dict.fromkeys(name for row in rows for name in row))
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    """Balancing CLI"""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grid", nargs="+", action="extend", default=[],
+                        help="name=v1,v2 axes, name is a game parameter or Class.stat")
+    parser.add_argument("--matches", type=int, default=100, help="matches per grid point")
+    parser.add_argument("--players", type=int, default=1)
+    parser.add_argument("--max-seconds", type=float, default=600, help="game time per match")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--batch", type=int, default=25, help="matches per worker task")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="write the report as CSV")
+    parser.add_argument("--json", help="write the report and throughput as JSON")
+    args = parser.parse_args()
+
+    grid = parse_grid(args.grid)
+    rows, throughput = run_grid(grid, args.matches, args.workers, args.players,
+                                int(args.max_seconds * GAME_FPS), args.batch, args.seed)
+
+    for row in rows:
+        params = " ".join(f"{name}={row[name]}" for name in rows[0] if name in grid[0])
+        print(f"{params or 'defaults'}: win {row['win_rate']:.0%}, "
+              f"score p50 {row['score_p50']} (p10 {row['score_p10']}, p90 {row['score_p90']}), "
+              f"survival p50 {row['survival_p50_s']:.1f} s")
+    print(f"{throughput['matches']} matches in {throughput['wall_s']:.1f} s: "
+          f"{throughput['matches_per_s_per_core']:.1f} matches/s/core on {args.workers} workers")
+
+    if args.csv:
+        write_csv(args.csv, rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"grid": rows, "throughput": throughput}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Startup asset loading benchmark: decoding and scaling PNGs vs. the pre-baked atlas"""
+import argparse
+import tempfile
+
+from asset_cache import AssetCache
+from atlas import ATLAS_ENTRIES, TextureAtlas, build_atlas, read_index
+from benchmarks.common import setup_display, timeit
+
+
+def load_pngs():
+    """Every atlas entry loaded the way ASSET_CACHE does without an atlas"""
+    cache = AssetCache()
+    for kind, path, *args in ATLAS_ENTRIES:
+        if kind == "grid":
+            cache.grid(path, *args)
+        else:
+            cache.image(path, *args)
+    return cache
+
+
+def load_atlas(cache_dir):
+    """Every atlas entry put into a fresh cache from the mapped atlas"""
+    cache = AssetCache()
+    atlas = TextureAtlas(read_index(cache_dir=cache_dir), cache_dir)
+    for key, value in atlas.items():
+        cache.put(key, value)
+    return cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_display()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        build = timeit(lambda: build_atlas(cache_dir=cache_dir), 1)
+        validate = timeit(lambda: read_index(cache_dir=cache_dir), args.repeat)
+        pngs = timeit(load_pngs, args.repeat)
+        atlas = timeit(lambda: load_atlas(cache_dir), args.repeat)
+
+    print(f"{'mode':<16}{'ms':>10}{'speedup':>9}")
+    print(f"{'png decode':<16}{pngs * 1e3:>10.2f}{1:>9.1f}")
+    print(f"{'atlas':<16}{atlas * 1e3:>10.2f}{pngs / atlas:>9.1f}")
+    print(f"{'  validate':<16}{validate * 1e3:>10.2f}")
+    print(f"{'  build once':<16}{build * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
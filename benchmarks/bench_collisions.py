@@ -0,0 +1,79 @@
+"""Collision stress test: broadphase scaling with bullet and enemy count"""
+import argparse
+import random
+import time
+
+from benchmarks.common import setup_display
+from bullet import Bullet
+from bullet_engine import create_bullet_store
+from enemy_unicorns import UnicornEnemy
+from game import SingleGame
+
+
+def populate(game, bullets, npcs, rng):
+    """Fills game with random NPCs, returns random player and NPC bullets"""
+    width, height = game.screen.get_size()
+    shooter = next(iter(game.players.values()))
+    game.npcs = [UnicornEnemy(rng.randrange(width), rng.randrange(height)) for _ in range(npcs)]
+    for npc in game.npcs:
+        npc.health = 10 ** 9  # keep population stable between repeats
+
+    def bullet(owner):
+        x, y = rng.randrange(width), rng.randrange(height)
+        return Bullet(x, y, x + 1, y, shooter=owner)
+
+    player_bullets = [bullet(shooter) for _ in range(bullets // 2)]
+    npc_bullets = [bullet(rng.choice(game.npcs)) for _ in range(bullets - bullets // 2)]
+    return player_bullets, npc_bullets
+
+
+def measure(game, player_bullets, npc_bullets, engine, repeat=5):
+    """Best time of check_bullet_collisions, bullet stores are refilled untimed"""
+    player = next(iter(game.players.values()))
+    best = float("inf")
+    for _ in range(repeat):
+        game.player_bullets = create_bullet_store(engine)
+        game.player_bullets.extend(player_bullets)
+        game.npc_bullets = create_bullet_store(engine)
+        game.npc_bullets.extend(npc_bullets)
+        player.health = 10 ** 9
+
+        start = time.perf_counter()
+        game.check_bullet_collisions()
+        best = min(best, time.perf_counter() - start)
+
+        # Bullets that hit are unbound, the rest go back to standalone state
+        game.player_bullets.clear()
+        game.npc_bullets.clear()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bullets", type=int, nargs="+", default=[625, 1250, 2500, 5000])
+    parser.add_argument("--npc-ratio", type=float, default=0.1, help="NPCs per bullet")
+    parser.add_argument("--engines", nargs="+", choices=["list", "numpy"],
+                        default=["list", "numpy"])
+    args = parser.parse_args()
+
+    screen = setup_display()
+    game = SingleGame(screen=screen)
+    rng = random.Random(1)
+
+    for engine in args.engines:
+        print(f"engine={engine}")
+        print(f"{'bullets':>8}{'npcs':>7}{'ms/tick':>10}{'us/bullet':>11}")
+        first = per_bullet = None
+        for count in args.bullets:
+            bullets = populate(game, count, int(count * args.npc_ratio), rng)
+            took = measure(game, *bullets, engine)
+            per_bullet = took / count * 1e6
+            first = first or per_bullet
+            print(f"{count:>8}{len(game.npcs):>7}{took * 1e3:>10.2f}{per_bullet:>11.2f}")
+
+        print(f"per-bullet cost growth {per_bullet / first:.2f}x over "
+              f"{args.bullets[-1] / args.bullets[0]:.0f}x entities (1.0 = linear)")
+
+
+if __name__ == "__main__":
+    main()
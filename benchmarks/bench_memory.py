@@ -0,0 +1,76 @@
+"""Memory per live entity: bytes per enemy, bullet and player.
+
+    python -m benchmarks.bench_memory --save before.json
+    python -m benchmarks.bench_memory --baseline before.json
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from assets import Assets
+from benchmarks.common import setup_display
+from bullet import Bullet
+from enemy_unicorns import UnicornEnemy
+from game_clock import FixedClock
+from player import Player
+
+
+def bytes_per_object(factory, count):
+    """Traced bytes allocated per object while count objects are alive"""
+    factory(0)  # loads shared, per-type data outside of the measurement
+    objects = [None] * count
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for index in range(count):
+        objects[index] = factory(index)
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objects
+    return used / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--save", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    args = parser.parse_args()
+
+    setup_display()
+    clock = FixedClock()
+    assets = Assets()
+    shooter = UnicornEnemy(0, 0, clock=clock)
+
+    results = {
+        "enemy": bytes_per_object(lambda i: UnicornEnemy(i % 1000, i % 800, clock=clock),
+                                  args.count),
+        "bullet": bytes_per_object(
+            lambda i: Bullet(i % 1000, i % 800, 500, 400, shooter=shooter,
+                             image=shooter.bullet_image, rotations=shooter.bullet_rotations),
+            args.count),
+        "player": bytes_per_object(lambda i: Player(f"P{i}", assets=assets, clock=clock),
+                                   max(1, args.count // 10)),
+    }
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    print(f"{'entity':<8}{'bytes':>10}" + (f"{'baseline':>10}{'saved':>8}" if baseline else ""))
+    for name, size in results.items():
+        line = f"{name:<8}{size:>10.0f}"
+        if name in baseline:
+            line += f"{baseline[name]:>10.0f}{1 - size / baseline[name]:>8.0%}"
+        print(line)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
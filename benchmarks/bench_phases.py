@@ -0,0 +1,102 @@
+"""Per-phase timing of the AbstractGame tick on scripted scenarios.
+
+    python -m benchmarks.bench_phases --save baseline.json
+    python -m benchmarks.bench_phases --baseline baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from benchmarks.common import setup_display
+from benchmarks.scenarios import SCENARIOS, build_scenario
+
+PHASES = ["timers", "players", "npcs", "bullets", "render", "collisions"]
+
+
+def measure(runner, ticks):
+    """Median ms per phase over ticks ticks of one scenario"""
+    game = runner.game
+    phases = [
+        ("timers", game.run_timers),
+        ("players", game.update_players),
+        ("npcs", game.update_npcs),
+        ("bullets", game.update_bullets),
+        ("render", game.render_all),
+        ("collisions", game.check_bullet_collisions),
+    ]
+    samples = {name: [] for name in PHASES}
+    for tick in range(ticks):
+        runner.input_source(game, tick)
+        for name, phase in phases:
+            start = time.perf_counter()
+            phase()
+            samples[name].append((time.perf_counter() - start) * 1e3)
+        runner.clock.advance(runner.dt)
+
+    result = {name: statistics.median(values) for name, values in samples.items()}
+    result["total"] = sum(result.values())
+    result["entities"] = len(game.npcs) + len(game.player_bullets) + len(game.npc_bullets)
+    return result
+
+
+def compare(results, baseline, threshold, min_delta=0.05):
+    """Phases slower than baseline by more than threshold (fraction) and min_delta ms"""
+    regressions = []
+    for scenario, phases in results.items():
+        for phase, took in phases.items():
+            if phase == "entities":
+                continue
+            base = baseline.get(scenario, {}).get(phase)
+            if base and took > base * (1 + threshold) and took - base > min_delta:
+                regressions.append((scenario, phase, base, took))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--bullet-engine", choices=["list", "numpy"], default=None,
+                        help="bullet engine, config.BULLET_ENGINE by default")
+    parser.add_argument("--npc-steering", choices=["direct", "flowfield"], default=None,
+                        help="NPC movement, config.NPC_STEERING by default")
+    parser.add_argument("--npc-update", choices=["objects", "numpy"], default=None,
+                        help="NPC update strategy, config.NPC_UPDATE by default")
+    parser.add_argument("--save", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown per phase, 0.25 = 25%%")
+    parser.add_argument("--min-delta", type=float, default=0.05,
+                        help="ignore slowdowns below this many ms (timer noise)")
+    args = parser.parse_args()
+
+    setup_display()
+    results = {}
+    columns = PHASES + ["total"]
+    print(f"{'scenario':<10}" + "".join(f"{name:>12}" for name in columns) + "  (ms/tick)")
+    for name in args.scenarios:
+        runner = build_scenario(*SCENARIOS[name], bullet_engine=args.bullet_engine,
+                                npc_steering=args.npc_steering, npc_update=args.npc_update)
+        results[name] = measure(runner, args.ticks)
+        print(f"{name:<10}" + "".join(f"{results[name][phase]:>12.3f}" for phase in columns))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        for scenario, phase, base, took in regressions:
+            print(f"REGRESSION {scenario}/{phase}: {base:.3f} -> {took:.3f} ms")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
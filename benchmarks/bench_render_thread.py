@@ -0,0 +1,120 @@
+"""Throughput of the single-threaded tick + render loop vs. the threaded pipeline.
+
+All modes run ticks back to back on the scripted scenarios. The pipeline
+simulates on a SimulationThread while the main thread draws:
+  lockstep  every tick is drawn, tick N + 1 simulates while frame N is drawn,
+            the same work as the single-threaded loop
+  latest    the newest snapshot is drawn, frames are dropped when behind
+The gain depends on how much of drawing runs without the GIL and needs a
+second core to show up, "ideal" is the limit of perfect overlap.
+
+    python -m benchmarks.bench_render_thread --ticks 200
+"""
+import argparse
+import os
+import time
+
+from benchmarks.common import setup_display
+from benchmarks.scenarios import SCENARIOS, build_scenario
+from pipeline import SimulationThread, SnapshotBuffer, capture_frame, draw_frame
+from renderer import FullRenderer
+
+
+def scripted_game(scenario, **game_kwargs):
+    """Game of a scenario whose key polling feeds the scripted bot inputs"""
+    runner = build_scenario(*SCENARIOS[scenario], **game_kwargs)
+    game = runner.game
+    ticks = iter(range(1 << 30))
+    game.handle_key_events = lambda: runner.input_source(game, next(ticks))
+    return game
+
+
+def run_sequential(game, ticks):
+    """(ticks/s, sim ms, render ms per tick) of one frame per tick on one thread"""
+    sim = render = 0.0
+    for _ in range(ticks):
+        start = time.perf_counter()
+        game.sim_tick()
+        middle = time.perf_counter()
+        game.render_all()
+        game.renderer.present()
+        end = time.perf_counter()
+        sim += middle - start
+        render += end - middle
+    return ticks / (sim + render), sim / ticks * 1e3, render / ticks * 1e3
+
+
+class LockstepBuffer(SnapshotBuffer):
+    """SnapshotBuffer whose publish() waits until the previous snapshot was drawn"""
+
+    def __init__(self):
+        super().__init__()
+        self.drawn = None
+
+    def publish(self, snapshot):
+        with self.condition:
+            self.condition.wait_for(lambda: self.latest is None or self.latest is self.drawn)
+        super().publish(snapshot)
+
+    def mark_drawn(self, snapshot):
+        """Lets the next publish() through"""
+        with self.condition:
+            self.drawn = snapshot
+            self.condition.notify_all()
+
+
+def run_pipeline(game, ticks, lockstep=False):
+    """(ticks/s, frames/s) with the simulation on its own thread"""
+    buffer = LockstepBuffer() if lockstep else SnapshotBuffer()
+    buffer.publish(capture_frame(game, 0))
+    simulation = SimulationThread(game, buffer, paced=False, max_ticks=ticks)
+    frames = 0
+    drawn = None
+    start = time.perf_counter()
+    simulation.start()
+    while True:
+        previous, latest = buffer.wait_newer(drawn)
+        if latest is drawn:
+            break
+        if lockstep:
+            buffer.mark_drawn(latest)  # the snapshot is immutable, the next tick may start
+        draw_frame(game, previous, latest, 1.0)
+        game.renderer.present()
+        drawn = latest
+        frames += 1
+    simulation.join()
+    elapsed = time.perf_counter() - start
+    if simulation.error is not None:
+        raise simulation.error
+    return simulation.ticks / elapsed, frames / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--bullet-engine", choices=["list", "numpy"], default="list")
+    args = parser.parse_args()
+
+    setup_display()
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    print(f"{cores} usable core(s), {args.ticks} ticks per run, full-screen redraw every frame")
+    print(f"{'scenario':<10}{'sim ms':>8}{'draw ms':>9}{'1-thread':>10}{'lockstep':>10}"
+          f"{'speedup':>9}{'ideal':>7}{'latest':>8}{'frames/s':>10}   (ticks/s)")
+    for scenario in args.scenarios:
+        # Full redraws keep the drawn area the same in every mode
+        kwargs = {"bullet_engine": args.bullet_engine}
+        sequential, sim_ms, render_ms = run_sequential(
+            scripted_game(scenario, renderer=FullRenderer(), **kwargs), args.ticks)
+        lockstep, _ = run_pipeline(
+            scripted_game(scenario, renderer=FullRenderer(), **kwargs), args.ticks, lockstep=True)
+        latest, frames = run_pipeline(
+            scripted_game(scenario, renderer=FullRenderer(), **kwargs), args.ticks)
+        ideal = (sim_ms + render_ms) / max(sim_ms, render_ms)
+        print(f"{scenario:<10}{sim_ms:>8.2f}{render_ms:>9.2f}{sequential:>10.1f}{lockstep:>10.1f}"
+              f"{lockstep / sequential:>9.2f}{ideal:>7.2f}{latest:>8.1f}{frames:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
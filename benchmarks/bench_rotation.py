@@ -0,0 +1,40 @@
+"""Bullet rotation benchmark: per-bullet rotate vs. precomputed rotation table"""
+import argparse
+import random
+
+from assets import UNICORN_BULLET_PATH
+from asset_cache import ASSET_CACHE, RotationTable
+from benchmarks.common import setup_display, timeit
+from bullet import Bullet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bullets", type=int, default=5000)
+    parser.add_argument("--steps", type=int, nargs="+", default=[32, 64, 128])
+    args = parser.parse_args()
+
+    setup_display()
+
+    image = ASSET_CACHE.image(UNICORN_BULLET_PATH, size=(32, 32))
+    rng = random.Random(1)
+    targets = [(rng.uniform(-500, 500), rng.uniform(-500, 500)) for _ in range(args.bullets)]
+
+    def spawn(rotations=None):
+        for tx, ty in targets:
+            Bullet(0, 0, tx, ty, image=image, rotations=rotations)
+
+    base = timeit(spawn)
+    print(f"{'mode':<16}{'build ms':>10}{'spawn ms':>10}{'us/bullet':>11}{'speedup':>9}")
+    print(f"{'rotate':<16}{'-':>10}{base * 1e3:>10.2f}{base / args.bullets * 1e6:>11.2f}{1:>9.1f}")
+
+    for steps in args.steps:
+        build = timeit(lambda s=steps: RotationTable(image, s, base_angle=180), 1)
+        table = RotationTable(image, steps, base_angle=180)
+        took = timeit(lambda t=table: spawn(t))
+        print(f"{f'table/{steps}':<16}{build * 1e3:>10.2f}{took * 1e3:>10.2f}"
+              f"{took / args.bullets * 1e6:>11.2f}{base / took:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Snapshot size and codec speed: bytes per tick, encode / decode µs.
+
+Captures consecutive ticks of a running headless game and encodes each one
+in full and as a delta against the previous tick, next to plain JSON.
+
+    python -m benchmarks.bench_snapshot --entities 100 1000 10000
+"""
+import argparse
+import json
+from functools import partial
+
+from benchmarks.common import setup_display, timeit
+from benchmarks.scenarios import build_scenario
+import snapshot
+
+
+def best_us(func, *args, repeat=1):
+    """Best wall time of repeat calls of func(*args) in µs"""
+    return timeit(partial(func, *args), repeat) * 1e6
+
+
+def json_size(state):
+    """Bytes of the same state as compact JSON lists"""
+    data = [state.tick, state.score, state.result] + [
+        [[eid, *fields] for eid, fields in section.items()] for section in state.sections()]
+    return len(json.dumps(data, separators=(",", ":")))
+
+
+def measure(entities, ticks, repeat, bullet_engine):
+    """Averages over ticks of a scenario with about entities live entities"""
+    players = 4
+    unicorns = max(1, (entities - players) // 4)
+    runner = build_scenario(unicorns, entities - players - unicorns, players,
+                            bullet_engine=bullet_engine)
+    game = runner.game
+
+    previous = snapshot.capture(game, 1)
+    totals = dict.fromkeys(("capture_us", "full_bytes", "delta_bytes", "json_bytes",
+                            "encode_full_us", "encode_delta_us", "decode_full_us",
+                            "decode_delta_us"), 0.0)
+    for tick in range(2, ticks + 2):
+        runner.step()
+        capture_us = best_us(snapshot.capture, game, tick)
+        state = snapshot.capture(game, tick)
+        full = snapshot.encode(state)
+        delta = snapshot.encode(state, previous)
+        assert snapshot.decode(delta, previous) == state
+
+        totals["capture_us"] += capture_us
+        totals["full_bytes"] += len(full)
+        totals["delta_bytes"] += len(delta)
+        totals["json_bytes"] += json_size(state)
+        totals["encode_full_us"] += best_us(snapshot.encode, state, repeat=repeat)
+        totals["encode_delta_us"] += best_us(snapshot.encode, state, previous, repeat=repeat)
+        totals["decode_full_us"] += best_us(snapshot.decode, full, repeat=repeat)
+        totals["decode_delta_us"] += best_us(snapshot.decode, delta, previous, repeat=repeat)
+        previous = state
+    return {name: value / ticks for name, value in totals.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--bullet-engine", default="list", choices=["list", "numpy"])
+    args = parser.parse_args()
+
+    setup_display()
+    print(f"{'entities':>8}{'json B':>10}{'full B':>10}{'delta B':>10}{'capture':>10}"
+          f"{'enc full':>10}{'enc delta':>10}{'dec full':>10}{'dec delta':>10}  (µs)")
+    for entities in args.entities:
+        r = measure(entities, args.ticks, args.repeat, args.bullet_engine)
+        print(f"{entities:>8}{r['json_bytes']:>10.0f}{r['full_bytes']:>10.0f}"
+              f"{r['delta_bytes']:>10.0f}{r['capture_us']:>10.0f}{r['encode_full_us']:>10.0f}"
+              f"{r['encode_delta_us']:>10.0f}{r['decode_full_us']:>10.0f}"
+              f"{r['decode_delta_us']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Checks that both NPC_UPDATE strategies move NPCs identically.
+
+Plays the same seeded headless match once per strategy and compares every
+NPC position after every tick, exits with status 1 on the first difference.
+
+    python -m benchmarks.check_npc_update --seed 7 --ticks 3000
+"""
+import argparse
+import sys
+
+from benchmarks.common import setup_display
+from game import SingleGame
+from headless import HeadlessRunner, RandomBot
+
+
+def npc_track(strategy, seed, ticks):
+    """NPC rect centers after every tick of a seeded match, and its result"""
+    runner = HeadlessRunner(SingleGame, input_source=RandomBot(seed), seed=seed,
+                            npc_update=strategy)
+    track = []
+    for _ in range(ticks):
+        if not runner.step():
+            break
+        track.append([npc.rect.center for npc in runner.game.npcs])
+    return track, runner.game.game_result, runner.game.score
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--ticks", type=int, default=3000)
+    args = parser.parse_args()
+
+    setup_display()
+    objects, *objects_end = npc_track("objects", args.seed, args.ticks)
+    batch, *batch_end = npc_track("numpy", args.seed, args.ticks)
+    for tick, (expected, actual) in enumerate(zip(objects, batch)):
+        if expected != actual:
+            print(f"tick {tick}: objects {expected[:5]} ... numpy {actual[:5]} ...")
+            sys.exit(1)
+    if len(objects) != len(batch) or objects_end != batch_end:
+        print(f"objects ended after {len(objects)} ticks {objects_end}, "
+              f"numpy after {len(batch)} ticks {batch_end}")
+        sys.exit(1)
+    print(f"identical NPC positions over {len(objects)} ticks, result {objects_end}")
+
+
+if __name__ == "__main__":
+    main()
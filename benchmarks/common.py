@@ -0,0 +1,19 @@
+"""Shared benchmark helpers"""
+import time
+
+from headless import headless_screen
+
+
+def setup_display():
+    """Initializes pygame with the dummy video driver, returns the screen"""
+    return headless_screen()
+
+
+def timeit(func, repeat=5):
+    """Best wall time of repeat calls of func in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,103 @@
+"""Scripted benchmark scenarios"""
+import random
+
+from bullet_engine import BulletArray
+from enemy_unicorns import UnicornEnemy
+from headless import BotGame, HeadlessRunner, RandomBot
+
+# name -> (unicorns, bullets, players)
+SCENARIOS = {
+    "small": (50, 100, 1),
+    "medium": (500, 1000, 2),
+    "large": (5000, 10000, 4),
+}
+
+IMMORTAL = 10 ** 9
+
+
+class ScenarioInput:
+    """Input source of a scenario: tops the population back up, then lets the bots play.
+
+    Contact damage releases NPCs, hits and off-screen culling drop bullets,
+    shots add new ones. Before every tick missing entities respawn at random
+    spots and surplus bullets are dropped, so each tick starts with exactly
+    the scenario's unicorns and bullets.
+    """
+
+    def __init__(self, unicorns, bullets, seed=1):
+        self.unicorns = unicorns
+        self.bullets = bullets
+        self.rng = random.Random(seed)
+        self.bot = RandomBot(seed)
+
+    def __call__(self, game, tick):
+        self.top_up(game)
+        self.bot(game, tick)
+
+    def top_up(self, game):
+        """Brings unicorns and bullets back to the scenario population"""
+        rng = self.rng
+        width, height = game.screen.get_size()
+        while len(game.npcs) < self.unicorns:
+            npc = game.acquire_npc(UnicornEnemy, rng.randrange(width), rng.randrange(height))
+            npc.health = npc.max_health = IMMORTAL
+            game.npcs.append(npc)
+
+        shooters = list(game.players.values())
+        # Half of the bullets belong to players, the other half to NPCs
+        trim(game.player_bullets, (self.bullets + 1) // 2)
+        trim(game.npc_bullets, self.bullets // 2)
+        while len(game.player_bullets) < (self.bullets + 1) // 2:
+            game.player_bullets.append(game.bullet_pool.acquire(
+                *self._path(width, height), shooter=rng.choice(shooters)))
+        while game.npcs and len(game.npc_bullets) < self.bullets // 2:
+            npc = rng.choice(game.npcs)
+            game.npc_bullets.append(game.bullet_pool.acquire(
+                *self._path(width, height), shooter=npc, image=npc.bullet_image,
+                rotations=npc.bullet_rotations))
+
+    def _path(self, width, height):
+        rng = self.rng
+        # Start point and target
+        return (rng.randrange(width), rng.randrange(height),
+                rng.randrange(width), rng.randrange(height))
+
+
+def trim(store, count):
+    """Drops the first bullets of a bullet store beyond count, releasing them"""
+    excess = len(store) - count
+    if excess <= 0:
+        return
+    if isinstance(store, BulletArray):
+        store.remove_slots(list(range(excess)))
+        return
+    dropped = store[:excess]
+    del store[:excess]
+    if store.release is not None:
+        for bullet in dropped:
+            store.release(bullet)
+
+
+def build_scenario(unicorns, bullets, players, seed=1, **game_kwargs):
+    """Headless runner with a steady population of unicorns, bullets and players.
+
+    Players and unicorns are immortal and nothing spawns on its own. The
+    runner's ScenarioInput restores the population before every tick, so
+    every measured tick starts with the same load.
+    """
+    source = ScenarioInput(unicorns, bullets, seed)
+    runner = HeadlessRunner(BotGame, input_source=source, player_count=players, **game_kwargs)
+    game = runner.game
+
+    game.spawn_interval_range = (IMMORTAL, IMMORTAL)
+    game.next_spawn_interval = IMMORTAL
+    game.schedule_spawn()
+    for player in game.players.values():
+        player.health = player.max_health = IMMORTAL
+
+    # Recycled so the timers of the NPC spawned by BotGame stop too
+    for npc in game.npcs:
+        game.release_npc(npc)
+    game.npcs = []
+    source.top_up(game)
+    return runner
@@ -0,0 +1,156 @@
+"""Network bot client module, load-tests the game server over localhost"""
+import argparse
+import asyncio
+import random
+import time
+
+from config import GAME_FPS
+from enums import KeyType
+import protocol
+import snapshot
+
+BOT_MOVES = [KeyType.UP.name, KeyType.DOWN.name, KeyType.LEFT.name, KeyType.RIGHT.name]
+
+
+class BotClient:
+    """Connects, sends random inputs every tick and counts received states"""
+
+    def __init__(self, name, seed=None):
+        self.name = name
+        self.rng = random.Random(seed)
+        self.uid = None
+        self.eid = None
+        self.history = snapshot.SnapshotHistory()
+        self.states = 0
+        self.deltas = 0
+        self.bytes_received = 0
+        self.inputs_sent = 0
+        self.last_state = None
+        self.latencies = []
+
+    async def run(self, host, port, seconds):
+        """Plays for seconds, returns per-bot statistics"""
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(protocol.encode_json(protocol.HELLO, {"name": self.name}))
+        await writer.drain()
+
+        kind, payload = await protocol.read_frame(reader)
+        if kind != protocol.WELCOME:
+            raise protocol.ProtocolError("Expected WELCOME")
+        welcome = protocol.decode_json(payload)
+        self.uid = welcome["uid"]
+        self.eid = welcome.get("id")
+        interval = 1 / welcome.get("fps", GAME_FPS)
+
+        receiver = asyncio.create_task(self.receive(reader, writer))
+        try:
+            await self.send_inputs(writer, interval, seconds)
+            writer.write(protocol.encode_frame(protocol.BYE))
+            await writer.drain()
+        finally:
+            receiver.cancel()
+            await asyncio.gather(receiver, return_exceptions=True)
+            writer.close()
+        return self.stats(seconds)
+
+    async def send_inputs(self, writer, interval, seconds):
+        """Random walk while shooting, one INPUT frame per tick"""
+        end = time.perf_counter() + seconds
+        move = self.rng.choice(BOT_MOVES)
+        while time.perf_counter() < end:
+            if self.rng.random() < 0.1:
+                move = self.rng.choice(BOT_MOVES)
+            writer.write(protocol.encode_json(protocol.INPUT, [move, KeyType.SHOOT.name]))
+            self.inputs_sent += 1
+            await writer.drain()
+            await asyncio.sleep(interval)
+
+    async def receive(self, reader, writer):
+        """Decodes and acknowledges STATE frames until the server closes"""
+        last = None
+        while True:
+            kind, payload = await protocol.read_frame(reader)
+            now = time.perf_counter()
+            if kind == protocol.STATE:
+                self.states += 1
+                self.bytes_received += len(payload)
+                state = self.decode_state(payload)
+                self.history.add(state)
+                self.last_state = state
+                writer.write(protocol.encode_ack(state.tick))
+                if last is not None:
+                    self.latencies.append(now - last)
+                last = now
+            elif kind == protocol.BYE:
+                return
+
+    def decode_state(self, payload):
+        """Snapshot of a full or delta STATE payload"""
+        base_tick = snapshot.HEADER.unpack_from(payload)[1]
+        if base_tick:
+            self.deltas += 1
+        return snapshot.decode(payload, self.history.get(base_tick))
+
+    def stats(self, seconds):
+        """States per second and bandwidth of this bot"""
+        gaps = sorted(self.latencies)
+        return {
+            "uid": self.uid,
+            "states_per_second": self.states / seconds,
+            "kbytes_per_second": self.bytes_received / seconds / 1024,
+            "delta_ratio": self.deltas / self.states if self.states else 0.0,
+            "inputs_sent": self.inputs_sent,
+            "max_state_gap_ms": gaps[-1] * 1e3 if gaps else 0.0,
+        }
+
+
+async def run_bots(host, port, bots, seconds, spawn_server=False):
+    """Runs bots concurrently, optionally against an in-process server"""
+    server = server_task = None
+    if spawn_server:
+        from server import GameServer  # pylint: disable=import-outside-toplevel
+        server = GameServer(host, port)
+        port = await server.start()
+        server_task = asyncio.create_task(server.run())
+
+    try:
+        clients = [BotClient(f"bot{index}", seed=index) for index in range(bots)]
+        results = await asyncio.gather(*(client.run(host, port, seconds) for client in clients),
+                                       return_exceptions=True)
+    finally:
+        if server is not None:
+            server_stats = server.stats()
+            await server.stop()
+            await asyncio.gather(server_task, return_exceptions=True)
+            print(f"server: {server_stats}")
+
+    failed = [result for result in results if isinstance(result, BaseException)]
+    ok = [result for result in results if not isinstance(result, BaseException)]
+    if ok:
+        rate = sum(result["states_per_second"] for result in ok) / len(ok)
+        gap = max(result["max_state_gap_ms"] for result in ok)
+        kbytes = sum(result["kbytes_per_second"] for result in ok) / len(ok)
+        deltas = sum(result["delta_ratio"] for result in ok) / len(ok)
+        print(f"{len(ok)} bots: {rate:.1f} states/s each, {kbytes:.1f} KiB/s each, "
+              f"{deltas:.0%} deltas, max state gap {gap:.0f} ms")
+    for error in failed:
+        print(f"bot failed: {error!r}")
+    return ok, failed
+
+
+def main():
+    """Bot client CLI"""
+    parser = argparse.ArgumentParser(description="Game server load-test bots")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--bots", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="run a server in this process on a free port")
+    args = parser.parse_args()
+    port = 0 if args.spawn_server and args.port == 8765 else args.port
+    asyncio.run(run_bots(args.host, port, args.bots, args.seconds, args.spawn_server))
+
+
+if __name__ == "__main__":
+    main()
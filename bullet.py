@@ -1,14 +1,34 @@
 import pygame
 import math
 from config import SCREEN_WIDTH, SCREEN_HEIGHT, BULLET_SIZE, BULLET_SPEED
+from entity_ids import next_entity_id
 
 class Bullet:
-    def __init__(self, x, y, target_x, target_y, color=(0, 0, 0), shooter=None, image=None):
+    """Single bullet, or a thin view of one slot once bound to a BulletArray"""
+
+    __slots__ = ("eid", "engine", "slot", "shooter", "damage", "color", "original_image",
+                 "rotations", "sprite_index", "image", "image_offset", "angle_deg", "dx", "dy",
+                 "_rect")
+
+    def __init__(self, x, y, target_x, target_y, color=(0, 0, 0), shooter=None, image=None,
+                 rotations=None):
+        self._rect = pygame.Rect(0, 0, BULLET_SIZE, BULLET_SIZE)
+        self.reset(x, y, target_x, target_y, color, shooter, image, rotations)
+
+    def reset(self, x, y, target_x, target_y, color=(0, 0, 0), shooter=None, image=None,
+              rotations=None):
+        """(Re)initializes the bullet, used by __init__ and object pools"""
+        self.eid = next_entity_id()
+        self.engine = None  # BulletArray holding the state while bound
+        self.slot = -1
         self.shooter = shooter
+        self.damage = shooter.damage if shooter is not None else 0
         self.color = color
         self.original_image = image  # Original, unrotated image
+        self.rotations = rotations
+        self.sprite_index = -1
         self.image = None
-        self.image_rect = None
+        self.image_offset = (0, 0)
 
         # Calculate movement vector
         angle = math.atan2(target_y - y, target_x - x)
@@ -17,39 +37,66 @@ class Bullet:
         self.dy = math.sin(angle) * BULLET_SPEED
 
         # Positioning
-        self.rect = pygame.Rect(0, 0, BULLET_SIZE, BULLET_SIZE)
-        self.rect.center = (x, y)
+        self._rect.size = (BULLET_SIZE, BULLET_SIZE)
+        self._rect.center = (x, y)
 
-        # Apply rotation if image provided
-        if self.original_image:
+        # Pick pre-rotated image from the table, rotate only as a fallback
+        if rotations is not None:
+            self.sprite_index = rotations.index(self.angle_deg)
+            self.image = rotations.surfaces[self.sprite_index]
+            self.image_offset = rotations.offsets[self.sprite_index]
+        elif self.original_image:
             try:
                 rotated = pygame.transform.rotate(self.original_image, -self.angle_deg + 180)
                 self.image = rotated
-                self.image_rect = self.image.get_rect(center=self.rect.center)
+                self.image_offset = (rotated.get_width() // 2, rotated.get_height() // 2)
                 #print("[Bullet] Rotated image created successfully")
             except Exception as e:
                 print("[Bullet ERROR] Rotation failed:", e)
                 self.image = None
-                self.image_rect = None
         else:
             pass
             #print("[Bullet] No image provided, using color:", self.color)
 
-    def update(self):
-        self.rect.x += self.dx
-        self.rect.y += self.dy
+    @property
+    def rect(self):
+        """Collision rect, read from the engine arrays while bound"""
+        if self.engine is None:
+            return self._rect
+        return self.engine.rect_at(self.slot)
 
-        if self.image_rect:
-            self.image_rect.center = self.rect.center
+    def bind(self, engine, slot):
+        """Hands the state over to engine arrays"""
+        self.engine = engine
+        self.slot = slot
 
-    def draw(self, screen):
-        if self.image and self.image_rect:
-            screen.blit(self.image, self.image_rect)
-        else:
-            pygame.draw.rect(screen, self.color, self.rect)
+    def unbind(self, left, top):
+        """Takes the state back from the engine, e.g. when culled"""
+        self._rect.topleft = (left, top)
+        self.engine = None
+        self.slot = -1
+
+    def update(self):
+        if self.engine is not None:
+            self.engine.move(self.slot)
+            return
+        self._rect.x += self.dx
+        self._rect.y += self.dy
+
+    def draw(self, screen, lag=0.0):
+        """Draws the bullet lag ticks behind its position, returns the screen area drawn"""
+        rect = self.rect
+        if lag:
+            rect = rect.move(round(-self.dx * lag), round(-self.dy * lag))
+        if self.image:
+            center_x, center_y = rect.center
+            offset_x, offset_y = self.image_offset
+            return screen.blit(self.image, (center_x - offset_x, center_y - offset_y))
+        return pygame.draw.rect(screen, self.color, rect)
 
     def is_off_screen(self):
+        rect = self.rect
         return (
-            self.rect.right < 0 or self.rect.left > SCREEN_WIDTH or
-            self.rect.bottom < 0 or self.rect.top > SCREEN_HEIGHT
+            rect.right < 0 or rect.left > SCREEN_WIDTH or
+            rect.bottom < 0 or rect.top > SCREEN_HEIGHT
         )
@@ -0,0 +1,325 @@
+"""Bullet storage engines module"""
+import pygame
+
+from config import (BULLET_ENGINE, BULLET_SIZE, COLLISION_CELL_SIZE,
+                    SCREEN_WIDTH, SCREEN_HEIGHT)
+from spatial import SpatialHash
+
+try:
+    import numpy as np
+except ImportError:  # optional, only the "numpy" engine needs it
+    np = None
+
+CELL_OFFSET = 1 << 12  # keeps cell keys of off-screen bullets positive
+CELL_STRIDE = 1 << 13
+
+
+class BulletSnapshot:
+    """Positions and looks of a bullet store at one tick, drawable from another thread"""
+
+    __slots__ = ("x", "y", "dx", "dy", "looks")
+
+    def __init__(self, x, y, dx, dy, looks):
+        self.x = x  # rect left / top
+        self.y = y
+        self.dx = dx
+        self.dy = dy
+        self.looks = looks  # (image, image_offset, color) per bullet
+
+    def __len__(self):
+        return len(self.x)
+
+    def draw(self, screen, lag=0.0):
+        """Draws all bullets lag ticks behind their positions, returns the screen areas drawn"""
+        half = BULLET_SIZE // 2
+        blits = []
+        areas = []
+        for x, y, dx, dy, (image, (offset_x, offset_y), color) in zip(
+                self.x, self.y, self.dx, self.dy, self.looks):
+            if lag:
+                x, y = x - dx * lag, y - dy * lag
+            x, y = int(x), int(y)
+            if image is not None:
+                blits.append((image, (x + half - offset_x, y + half - offset_y)))
+            else:
+                areas.append(pygame.draw.rect(screen, color, (x, y, BULLET_SIZE, BULLET_SIZE)))
+        areas.extend(screen.blits(blits))
+        return areas
+
+
+class BulletList(list):
+    """Plain list of Bullet objects, updated and tested one by one"""
+
+    def __init__(self, release=None):
+        super().__init__()
+        self.release = release  # called with every removed bullet, e.g. ObjectPool.release
+
+    def update(self):
+        """Moves every bullet and drops the ones that left the screen"""
+        remaining = []
+        for bullet in self:
+            bullet.update()
+            if not bullet.is_off_screen():
+                remaining.append(bullet)
+            elif self.release is not None:
+                self.release(bullet)
+        self[:] = remaining
+
+    def collide(self, targets, on_hit, grid=None):
+        """Calls on_hit(bullet, target) for the first living target hit by each bullet
+        and removes bullets that hit something"""
+        grid = (grid or SpatialHash()).build(targets)
+        remaining = []
+        for bullet in self:
+            hit = next((target for target in grid.query(bullet.rect) if target.health > 0), None)
+            if hit is None:
+                remaining.append(bullet)
+            else:
+                on_hit(bullet, hit)
+                if self.release is not None:
+                    self.release(bullet)
+        self[:] = remaining
+
+    def draw(self, screen, lag=0.0):
+        """Draws all bullets lag ticks behind their positions, returns the screen areas drawn"""
+        return [bullet.draw(screen, lag) for bullet in self]
+
+    def snapshot(self):
+        """BulletSnapshot of the current positions"""
+        rects = [bullet.rect for bullet in self]
+        looks = [(bullet.image, bullet.image_offset, bullet.color) for bullet in self]
+        return BulletSnapshot([rect.x for rect in rects], [rect.y for rect in rects],
+                              [bullet.dx for bullet in self], [bullet.dy for bullet in self], looks)
+
+
+class BulletArray:
+    """Struct-of-arrays bullet storage with vectorized movement, culling and hit tests.
+
+    Acts as a drop-in for BulletList: append() takes a Bullet and binds it as
+    a view of its slot, iteration yields the live views. Removal swaps the
+    last live slot into the freed one.
+    """
+
+    def __init__(self, capacity=256, release=None):
+        self.release = release  # called with every removed bullet, e.g. ObjectPool.release
+        self.count = 0
+        self.capacity = capacity
+        self.x = np.zeros(capacity)  # rect left / top, float for sub-pixel movement
+        self.y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.views = []  # Bullet objects by slot, they keep shooter, damage and looks
+
+    def _arrays(self):
+        return (self.x, self.y, self.dx, self.dy)
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in ("x", "y", "dx", "dy"):
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.views[:self.count])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.views[:self.count][index]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("bullet index out of range")
+        return self.views[index]
+
+    def append(self, bullet):
+        """Stores bullet state in the arrays, the bullet becomes a view"""
+        if self.count == self.capacity:
+            self._grow()
+        slot = self.count
+        rect = bullet.rect
+        self.x[slot] = rect.left
+        self.y[slot] = rect.top
+        self.dx[slot] = bullet.dx
+        self.dy[slot] = bullet.dy
+        bullet.bind(self, slot)
+        self.views.append(bullet)
+        self.count += 1
+
+    def extend(self, bullets):
+        """Appends several bullets"""
+        for bullet in bullets:
+            self.append(bullet)
+
+    def clear(self):
+        """Removes all bullets"""
+        self.remove_slots(np.arange(self.count))
+
+    def rect_at(self, slot):
+        """pygame.Rect of one slot"""
+        return pygame.Rect(int(self.x[slot]), int(self.y[slot]), BULLET_SIZE, BULLET_SIZE)
+
+    def move(self, slot):
+        """Moves a single slot, update() moves all of them at once"""
+        self.x[slot] += self.dx[slot]
+        self.y[slot] += self.dy[slot]
+
+    def update(self):
+        """Moves every bullet and drops the ones that left the screen"""
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        x += self.dx[:n]
+        y += self.dy[:n]
+        off = ((x + BULLET_SIZE < 0) | (x > SCREEN_WIDTH) |
+               (y + BULLET_SIZE < 0) | (y > SCREEN_HEIGHT))
+        self.remove_slots(np.flatnonzero(off))
+
+    def remove_slots(self, slots):
+        """Swap-removes the given distinct slots, compacting live bullets to the front"""
+        removed = len(slots)
+        if not removed:
+            return
+        n = self.count
+        new_n = n - removed
+        dead = np.zeros(n, dtype=bool)
+        dead[slots] = True
+        holes = np.flatnonzero(dead[:new_n])
+        fillers = new_n + np.flatnonzero(~dead[new_n:])
+
+        views = self.views
+        x, y = self.x, self.y
+        released = [views[slot] for slot in np.flatnonzero(dead).tolist()]
+        for bullet in released:
+            bullet.unbind(float(x[bullet.slot]), float(y[bullet.slot]))
+        for arr in self._arrays():
+            arr[holes] = arr[fillers]
+        for hole, filler in zip(holes.tolist(), fillers.tolist()):
+            view = views[filler]
+            views[hole] = view
+            view.slot = hole
+        del views[new_n:]
+        self.count = new_n
+
+        if self.release is not None:
+            for bullet in released:
+                self.release(bullet)
+
+    def overlaps(self, rects):
+        """(slots, target indices) of every bullet / rect overlap, sorted by slot.
+
+        Bullets are binned into grid cells by their top-left corner and each
+        rect probes the cells it can reach, all as array operations.
+        """
+        n = self.count
+        if not n or not rects:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        cell = COLLISION_CELL_SIZE
+        x, y = self.x[:n], self.y[:n]
+        keys = ((np.floor(x / cell).astype(np.int64) + CELL_OFFSET) * CELL_STRIDE
+                + np.floor(y / cell).astype(np.int64) + CELL_OFFSET)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+
+        bounds = np.array([(r.left, r.top, r.right, r.bottom) for r in rects], dtype=np.float64)
+        left, top, right, bottom = bounds.T
+        x0 = np.floor((left - BULLET_SIZE) / cell).astype(np.int64)
+        y0 = np.floor((top - BULLET_SIZE) / cell).astype(np.int64)
+        x1 = np.floor((right - 1) / cell).astype(np.int64)
+        y1 = np.floor((bottom - 1) / cell).astype(np.int64)
+
+        target_ids, cell_keys = [], []
+        indices = np.arange(len(rects))
+        for step_x in range(int((x1 - x0).max()) + 1):
+            for step_y in range(int((y1 - y0).max()) + 1):
+                valid = (x0 + step_x <= x1) & (y0 + step_y <= y1)
+                target_ids.append(indices[valid])
+                cell_keys.append((x0[valid] + step_x + CELL_OFFSET) * CELL_STRIDE
+                                 + y0[valid] + step_y + CELL_OFFSET)
+        target_ids = np.concatenate(target_ids)
+        cell_keys = np.concatenate(cell_keys)
+
+        start = np.searchsorted(sorted_keys, cell_keys, side="left")
+        counts = np.searchsorted(sorted_keys, cell_keys, side="right") - start
+        total = int(counts.sum())
+        if not total:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        # Expand each (target, cell) pair into one candidate per bullet in the cell
+        pair_targets = np.repeat(target_ids, counts)
+        run_starts = np.repeat(start - (np.cumsum(counts) - counts), counts)
+        slots = order[run_starts + np.arange(total)]
+
+        bx, by = x[slots], y[slots]
+        hit = ((bx < right[pair_targets]) & (bx + BULLET_SIZE > left[pair_targets]) &
+               (by < bottom[pair_targets]) & (by + BULLET_SIZE > top[pair_targets]))
+        slots, pair_targets = slots[hit], pair_targets[hit]
+        order = np.lexsort((pair_targets, slots))
+        return slots[order], pair_targets[order]
+
+    def collide(self, targets, on_hit, grid=None):  # pylint: disable=unused-argument
+        """Calls on_hit(bullet, target) for the first living target hit by each bullet
+        and removes bullets that hit something"""
+        slots, target_ids = self.overlaps([target.rect for target in targets])
+        hits = []
+        last = -1
+        views = self.views
+        for slot, target_id in zip(slots.tolist(), target_ids.tolist()):
+            if slot == last:
+                continue
+            target = targets[target_id]
+            if target.health <= 0:
+                continue
+            on_hit(views[slot], target)
+            hits.append(slot)
+            last = slot
+        self.remove_slots(np.array(hits, dtype=np.int64))
+
+    def draw(self, screen, lag=0.0):
+        """Draws all bullets lag ticks behind their positions in one blits call,
+        returns the screen areas drawn"""
+        n = self.count
+        if not n:
+            return []
+        half = BULLET_SIZE // 2
+        x, y = self.x[:n], self.y[:n]
+        if lag:
+            x = x - self.dx[:n] * lag
+            y = y - self.dy[:n] * lag
+        xs = x.astype(np.int64).tolist()
+        ys = y.astype(np.int64).tolist()
+
+        blits = []
+        areas = []
+        for view, x, y in zip(self.views, xs, ys):
+            if view.image is not None:
+                offset_x, offset_y = view.image_offset
+                blits.append((view.image, (x + half - offset_x, y + half - offset_y)))
+            else:
+                areas.append(pygame.draw.rect(screen, view.color, (x, y, BULLET_SIZE, BULLET_SIZE)))
+        areas.extend(screen.blits(blits))
+        return areas
+
+
+    def snapshot(self):
+        """BulletSnapshot of the current positions, copied out of the arrays"""
+        n = self.count
+        return BulletSnapshot(self.x[:n].tolist(), self.y[:n].tolist(),
+                              self.dx[:n].tolist(), self.dy[:n].tolist(),
+                              [(view.image, view.image_offset, view.color)
+                               for view in self.views[:n]])
+
+
+def create_bullet_store(engine=BULLET_ENGINE, release=None):
+    """Bullet container of the engine selected in config, "list" or "numpy" """
+    if engine == "numpy":
+        if np is not None:
+            return BulletArray(release=release)
+        print("[WARN] NumPy is not installed, falling back to the list bullet engine")
+    return BulletList(release=release)
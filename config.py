@@ -1,4 +1,5 @@
 """Config module"""
+import os
 
 PLAYER_WIDTH  = 40
 PLAYER_HEIGHT = 40
@@ -10,9 +11,78 @@ SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 800
 
 
+# Simulation ticks per second, the interactive loop renders independently of it
 GAME_FPS = 50
+# Interactive frames per second, 0 renders as often as possible. Positions are
+# interpolated between the last two simulation ticks when RENDER_INTERPOLATION is on
+RENDER_FPS = 60
+RENDER_INTERPOLATION = True
+# Most real time one frame hands to the simulation, beyond it the game slows down
+MAX_FRAME_TIME = 250
+# Simulates on a worker thread that hands frame snapshots to rendering (pipeline.py)
+RENDER_THREAD = False
 CLIENT_REFRESH_COEF = 1
 INFO_TIMER = 1
 
 BULLET_SPEED = 5
 BULLET_SIZE = 5
+
+# Angle buckets of pre-rotated bullet sprites (at most MAX_SPRITES), 0 rotates every bullet
+BULLET_ROTATION_STEPS = 64
+# Sprites a bullet record of a network snapshot can address, its field is one byte
+MAX_SPRITES = 255
+
+# Cell size of the collision broadphase grid in pixels
+COLLISION_CELL_SIZE = 64
+
+# Bucket size of the per-tick nearest target index in pixels
+TARGET_CELL_SIZE = 128
+
+# Frame profiler, toggled in game with F3
+PROFILER_ENABLED = False
+PROFILER_WINDOW = 250  # frames kept for percentiles
+PROFILER_SINK = None  # path of a JSONL file with per-frame records
+
+# Rendered text Surfaces kept by the text cache
+TEXT_CACHE_SIZE = 256
+
+# Push only changed screen areas, full flip once they cover more than the fraction
+DIRTY_RECT_RENDERING = False
+DIRTY_RECT_MAX_FRACTION = 0.4
+
+# Bullet storage: "list" of objects or "numpy" struct-of-arrays (needs NumPy)
+BULLET_ENGINE = "list"
+
+# Objects kept for reuse by the bullet pool and by each enemy class pool
+BULLET_POOL_SIZE = 2048
+NPC_POOL_SIZE = 256
+
+# Outgoing frames buffered per network client before the oldest is dropped
+SERVER_SEND_QUEUE = 8
+
+# Session manager admission control: most sessions per process and the share
+# of one core their measured tick CPU time may add up to
+SESSION_MAX = 64
+SESSION_CPU_BUDGET = 0.8
+
+# Score needed to win once every player is dead
+WIN_SCORE = 200
+
+# NPC movement: "direct" chases the nearest player, "flowfield" follows a
+# shared distance field (flowfield.py) with optional separation
+NPC_STEERING = "direct"
+FLOW_CELL_SIZE = 32
+SEPARATION_RADIUS = 16
+SEPARATION_WEIGHT = 1.0  # 0 disables separation
+
+# NPC update strategy: "objects" updates one enemy at a time, "numpy" moves,
+# animates and fires all of them as array operations (npc_engine.py)
+NPC_UPDATE = "objects"
+
+# Pre-baked texture atlas of every scaled sprite (atlas.py), rebuilt in this
+# directory whenever a source PNG changes
+ATLAS_ENABLED = True
+ATLAS_CACHE_DIR = os.path.join("assets", ".atlas")
+
+# Call logging of functions wrapped in decorators.log_decorator
+DEBUG_LOG = False
@@ -2,6 +2,8 @@
 
 import functools
 
+from config import DEBUG_LOG
+
 def log(func):
     """Dekorátor pro logování vstupních parametrů a výstupní hodnoty funkce."""
     @functools.wraps(func)
@@ -12,7 +14,13 @@ def log(func):
         return result
 
 def log_decorator(func):
-    """Dekorátor pro logování vstupních parametrů a výstupní hodnoty funkce."""
+    """Dekorátor pro logování vstupních parametrů a výstupní hodnoty funkce.
+
+    Bez DEBUG_LOG vrací funkci beze změny, volání pak nic nestojí.
+    """
+    if not DEBUG_LOG:
+        return func
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         print(f"Volání: {func.__name__} s args={args} a kwargs={kwargs}")
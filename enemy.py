@@ -2,35 +2,76 @@
 import math
 import pygame
 from config import NPC_SPEED
+from game_clock import DEFAULT_CLOCK
+from entity_ids import next_entity_id
 
 class Enemy:
-    """Base enemy class, extendable for specific enemy types like Unicorn"""
-
-    def __init__(self, x, y):
+    """Base enemy class, extendable for specific enemy types like Unicorn.
+
+    Instances only hold per-life state in __slots__. Stats and animation
+    frames are class attributes, the per-type prototype shared by every
+    enemy of that type; subclasses override them in the class body.
+    """
+
+    __slots__ = ("eid", "clock", "x", "y", "health", "max_health", "rect", "direction", "action",
+                 "frame_index", "frame_timer", "scheduled_frames", "image")
+
+    # Prototype stats
+    type_id = 0  # enemy type in network snapshots
+    base_health = 100
+    damage = 10
+    speed = NPC_SPEED
+    score = 25
+    frame_delay = 100  # ms
+
+    # Prototype data, loaded once per type by load_prototype()
+    animations = {}
+    bullet_image = None
+    bullet_rotations = None
+
+    def __init__(self, x, y, clock=None):
+        type(self).ensure_prototype()
+        self.reset(x, y, clock)
+
+    @classmethod
+    def ensure_prototype(cls):
+        """Loads the prototype of this exact type unless already done"""
+        if not cls.__dict__.get("prototype_loaded"):
+            cls.load_prototype()
+            cls.prototype_loaded = True
+
+    @classmethod
+    def load_prototype(cls):
+        """Loads data shared by all instances of the type"""
+        cls.animations = cls.load_animations()
+
+    @classmethod
+    def load_animations(cls):
+        """Animation frames by (direction, action)"""
+        return {}
+
+    def reset(self, x, y, clock=None):
+        """(Re)initializes per-life state, used by __init__ and object pools"""
+        self.eid = next_entity_id()
+        self.clock = clock or DEFAULT_CLOCK
         self.x = x
         self.y = y
-        self.health = 100
-        self.max_health = 100
-        self.damage = 10
-        self.speed = NPC_SPEED
-        self.score = 25
+        self.health = self.base_health
+        self.max_health = self.base_health
         self.rect = pygame.Rect(x, y, 32, 32)  # Default size; override in subclass
-        self.animations = {}
         self.direction = "down"
         self.action = "idle"
         self.frame_index = 0
         self.frame_timer = 0
-        self.frame_delay = 100  # ms
+        self.scheduled_frames = False  # frames advanced by game timers instead of animate()
         self.image = None
 
     def update(self, **kwargs):
         """Updates position and animation"""
-        players = [p for p in kwargs["players"].values() if p.health > 0]
-        if not players:
+        nearest = self.get_target(**kwargs)
+        if nearest is None:
             return
 
-        nearest = self.find_closest(players)
-
         dx = dy = 0
         if nearest.rect.x > self.rect.x:
             dx = self.speed
@@ -56,17 +97,43 @@ class Enemy:
 
         self.animate()
 
+    def steer(self, vx, vy):
+        """Moves along a steering vector scaled by speed, used by flow field steering"""
+        rect = self.rect
+        # x / y keep the sub-pixel center, resynced when something else moved the rect
+        if round(self.x) != rect.centerx or round(self.y) != rect.centery:
+            self.x, self.y = rect.center
+        if vx or vy:
+            self.x += vx * self.speed
+            self.y += vy * self.speed
+            rect.center = (round(self.x), round(self.y))
+            self.direction = self.get_direction(vx, vy)
+            self.action = "move"
+        else:
+            self.action = "idle"
+        self.animate()
+
     def animate(self):
         """Updates animation frames"""
         key = (self.direction, self.action)
-        if key not in self.animations:
+        if key not in self.animations or self.scheduled_frames:
             return
 
-        now = pygame.time.get_ticks()
+        now = self.clock.now()
         if now - self.frame_timer >= self.frame_delay:
-            self.frame_index = (self.frame_index + 1) % len(self.animations[key])
-            self.image = self.animations[key][self.frame_index]
-            self.frame_timer = now
+            self.advance_frame(now)
+
+    def next_frame_at(self):
+        """Clock time the next animation frame is due"""
+        return self.frame_timer + self.frame_delay
+
+    def advance_frame(self, now):
+        """Moves to the next frame of the current animation"""
+        self.frame_timer = now
+        frames = self.animations.get((self.direction, self.action))
+        if frames:
+            self.frame_index = (self.frame_index + 1) % len(frames)
+            self.image = frames[self.frame_index]
 
     def get_direction(self, dx, dy):
         """Returns cardinal direction string based on movement delta"""
@@ -76,32 +143,52 @@ class Enemy:
             return "down" if dy > 0 else "up"
         
 
-    def get_shot_target(self, players):
+    def get_target(self, **kwargs):
+        """Movement target, precomputed by the game when passed as target"""
+        if "target" in kwargs:
+            return kwargs["target"]
+        players = [p for p in kwargs["players"].values() if p.health > 0]
+        return self.find_closest(players) if players else None
+
+    def get_shot_target(self, players, target_index=None):
         """Select target player"""
+        if target_index is not None:
+            return target_index.nearest_one(*self.rect.center)
         players = [p for p in players if p.health > 0]
         return self.find_closest(players) if players else None
 
+    def draw_copy(self):
+        """Detached copy with just the state draw() reads, drawable while the original moves on"""
+        copy = object.__new__(type(self))
+        copy.eid = self.eid
+        copy.image = self.image
+        copy.rect = self.rect.copy()
+        copy.health = self.health
+        copy.max_health = self.max_health
+        return copy
+
     def draw_lifebar(self, screen):
         bar_width = self.rect.width
         fill = (self.health / self.max_health) * bar_width
-        pygame.draw.rect(screen, (255, 0, 0), (self.rect.x, self.rect.y - 10, bar_width, 5))
+        area = pygame.draw.rect(screen, (255, 0, 0), (self.rect.x, self.rect.y - 10, bar_width, 5))
         pygame.draw.rect(screen, (0, 255, 0), (self.rect.x, self.rect.y - 10, fill, 5))
+        return area
     
     def draw(self, screen):
-        """Draws enemy with visible border"""
+        """Draws enemy with visible border, returns the screen area drawn"""
         if self.image:
             # Create a rect centered on current position, based on image size
             image_rect = self.image.get_rect(center=self.rect.center)
             
             # Draw the image
-            screen.blit(self.image, image_rect)
+            area = screen.blit(self.image, image_rect)
 
         else:
             # If no image, draw fallback red rectangle + border
-            pygame.draw.rect(screen, (255, 0, 0), self.rect)
+            area = pygame.draw.rect(screen, (255, 0, 0), self.rect)
             pygame.draw.rect(screen, (0, 0, 255), self.rect, 1)
 
-        self.draw_lifebar(screen)
+        return area.union(self.draw_lifebar(screen))
 
 
     def distance(self, rect1, rect2):
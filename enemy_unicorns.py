@@ -2,26 +2,37 @@ import os
 import pygame
 from enemy import Enemy
 from spritesheet import SpriteSheet
-from assets import Assets  # ✅ Import to access unicorn bullet
+from assets import load_unicorn_bullet, load_unicorn_bullet_rotations
 
 class UnicornEnemy(Enemy):
-    def __init__(self, x, y):
-        super().__init__(x, y)
-
-        # Custom stats
-        self.health = 10
-        self.max_health = 10
-        self.damage = 8
-        self.speed = 1.5
-        self.score = 15
-        self.frame_delay = 120
-
-        # Sprite settings
-        self.sprite_cols = 5  # actions
-        self.sprite_rows = 4  # directions
-        self.sprite_scale = 0.3
-        self.frame_width = 32
-        self.frame_height = 32
+    __slots__ = ()
+
+    # Custom stats
+    type_id = 1
+    base_health = 10
+    damage = 8
+    speed = 1.5
+    score = 15
+    frame_delay = 120
+
+    # Sprite settings
+    sprite_cols = 5  # actions
+    sprite_rows = 4  # directions
+    sprite_scale = 0.3
+    frame_width = 32
+    frame_height = 32
+
+    @classmethod
+    def load_prototype(cls):
+        super().load_prototype()
+
+        # Shared bullet image from the asset cache
+        cls.bullet_image = load_unicorn_bullet()
+        cls.bullet_rotations = load_unicorn_bullet_rotations()
+        #print("[DEBUG] Bullet image set:", type(cls.bullet_image))
+
+    def reset(self, x, y, clock=None):
+        super().reset(x, y, clock)
 
         # Initial rect (will be updated after first frame)
         scaled_w = int(self.frame_width * self.sprite_scale * 1.2)
@@ -29,32 +40,20 @@ class UnicornEnemy(Enemy):
         self.rect = pygame.Rect(0, 0, scaled_w, scaled_h)
         self.rect.center = (x, y)
 
-        # Load animations
-        self.animations = self.load_animations()
-
         # Animation state
-        self.animation_state = {
-            "direction": "down",
-            "action": "idle",
-            "frame_index": 0,
-            "last_update": pygame.time.get_ticks()
-        }
-
-        # Load bullet image
-        self.assets = Assets()
-        self.bullet_image = self.assets.unicorn_bullet
-        #print("[DEBUG] Bullet image set:", type(self.bullet_image))
+        self.frame_timer = self.clock.now()
 
         self.animate()
 
-    def load_animations(self):
+    @classmethod
+    def load_animations(cls):
         animations = {}
         direction_order = ["down", "left", "right", "up"]
         action_order = ["idle", "idle2", "move", "move2", "shoot"]
 
         sprite_path = os.path.join("assets", "sprites", "characters", "Unicorn.png")
         sheet = SpriteSheet(sprite_path)
-        grid = sheet.load_grid(cols=self.sprite_cols, rows=self.sprite_rows, scale=self.sprite_scale)
+        grid = sheet.load_grid(cols=cls.sprite_cols, rows=cls.sprite_rows, scale=cls.sprite_scale)
 
         for row, direction in enumerate(direction_order):
             for col, action in enumerate(action_order):
@@ -68,50 +67,61 @@ class UnicornEnemy(Enemy):
         return animations
 
     def update(self, **kwargs):
-        players = kwargs["players"]
-        living_players = [p for p in players.values() if p.health > 0]
-        if not living_players:
+        target = self.get_target(**kwargs)
+        if target is None:
             return
 
-        target = self.find_closest(living_players)
         dx = target.rect.centerx - self.rect.centerx
         dy = target.rect.centery - self.rect.centery
 
         direction = self.get_direction(dx, dy)
-        self.animation_state["direction"] = direction
+        self.direction = direction
 
         if abs(dx) > 2 or abs(dy) > 2:
             self.rect.x += self.speed if dx > 0 else -self.speed
             self.rect.y += self.speed if dy > 0 else -self.speed
-            self.animation_state["action"] = "move"
+            self.action = "move"
         else:
-            self.animation_state["action"] = "idle"
+            self.action = "idle"
 
         self.animate()
 
-    def animate(self):
-        now = pygame.time.get_ticks()
-        state = self.animation_state
-        key = (state["direction"], state["action"])
-
+    def animation_frames(self):
+        key = (self.direction, self.action)
         if key not in self.animations:
             print(f"[WARN] Missing animation for {key}, defaulting to ('down', 'idle')")
             key = ("down", "idle")
+        return self.animations[key]
 
-        frames = self.animations[key]
-        if now - state["last_update"] > self.frame_delay:
-            state["frame_index"] = (state["frame_index"] + 1) % len(frames)
-            state["last_update"] = now
+    def next_frame_at(self):
+        return self.frame_timer + self.frame_delay + 1
 
+    def advance_frame(self, now):
+        frames = self.animation_frames()
         if frames:
-            self.image = frames[state["frame_index"]]
-            # ✅ Update rect to match image frame
-            self.rect = self.image.get_rect(center=self.rect.center)
+            self.frame_index = (self.frame_index + 1) % len(frames)
+        self.frame_timer = now
+        self.animate()
+
+    def animate(self):
+        frames = self.animation_frames()
+        if not self.scheduled_frames:
+            now = self.clock.now()
+            if now - self.frame_timer > self.frame_delay:
+                self.frame_index = (self.frame_index + 1) % len(frames)
+                self.frame_timer = now
+
+        if frames:
+            self.image = frames[self.frame_index]
+            # ✅ Update rect to match image frame, in place
+            center = self.rect.center
+            self.rect.size = self.image.get_size()
+            self.rect.center = center
 
     def draw(self, screen):
         if not isinstance(self.image, pygame.Surface):
             print("[ERROR] self.image is not a Surface:", type(self.image))
-            return
+            return None
 
-        screen.blit(self.image, self.rect.topleft)
-        self.draw_lifebar(screen)
+        area = screen.blit(self.image, self.rect.topleft)
+        return area.union(self.draw_lifebar(screen))
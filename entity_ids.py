@@ -0,0 +1,9 @@
+"""Entity id module"""
+import itertools
+
+_ids = itertools.count(1)
+
+
+def next_entity_id():
+    """Process-unique u32 id, pooled objects take a fresh one on every reset"""
+    return next(_ids) & 0xFFFFFFFF
@@ -0,0 +1,266 @@
+"""Flow field steering module"""
+import heapq
+import math
+
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, FLOW_CELL_SIZE
+
+try:
+    import numpy as np
+except ImportError:  # optional, separation falls back to a pure Python pass
+    np = None
+
+STRAIGHT, DIAGONAL = 10, 14  # chamfer step costs, close to 1 : sqrt(2)
+NEIGHBOURS = [(dx, dy, DIAGONAL if dx and dy else STRAIGHT)
+              for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+NO_STEERING = (0.0, 0.0)
+CELL_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+class FlowField:
+    """Distance field to the nearest player over a coarse grid of the playfield.
+
+    Every cell stores the unit vector towards its neighbour one step closer
+    to a player and which player that is. Cells holding a player steer
+    straight at it. The field is only recomputed when a player enters
+    another cell, otherwise update() just refreshes the player positions.
+    """
+
+    def __init__(self, cell_size=FLOW_CELL_SIZE, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        count = self.cols * self.rows
+        half = cell_size / 2
+        self.centers = [((index % self.cols) * cell_size + half,
+                         (index // self.cols) * cell_size + half) for index in range(count)]
+        self.neighbours = [self._neighbours(index) for index in range(count)]
+        self.distance = [0] * count
+        self.vectors = [None] * count  # None in cells holding a player or out of reach
+        self.owner = [-1] * count  # index into self.players
+        self.players = []
+        self.goals = {}  # player cell -> player center
+        self.key = None
+        self.builds = 0
+        self.vector_array = None  # vectors and owner as arrays for steering(), NumPy only
+        self.owner_array = None
+
+    def _neighbours(self, index):
+        col, row = index % self.cols, index // self.cols
+        result = []
+        for dx, dy, cost in NEIGHBOURS:
+            x, y = col + dx, row + dy
+            if 0 <= x < self.cols and 0 <= y < self.rows:
+                result.append((y * self.cols + x, cost))
+        return result
+
+    def cell_index(self, x, y):
+        """Grid cell of a point, points off the playfield clamp to the border"""
+        col = min(self.cols - 1, max(0, int(x) // self.cell_size))
+        row = min(self.rows - 1, max(0, int(y) // self.cell_size))
+        return row * self.cols + col
+
+    def update(self, players):
+        """Brings the field up to date with the living players, usually once per tick"""
+        cells = [self.cell_index(*player.rect.center) for player in players]
+        key = tuple(zip(map(id, players), cells))
+        self.players = players
+        self.goals = {}
+        for player, cell in zip(players, cells):
+            self.goals.setdefault(cell, player.rect.center)
+        if key != self.key:
+            self.key = key
+            self.build(cells)
+
+    def build(self, sources):
+        """Dijkstra from every player cell at once"""
+        count = self.cols * self.rows
+        distance = [math.inf] * count
+        next_cell = [-1] * count
+        owner = [-1] * count
+        vectors = [None] * count
+        heap = []
+        for player_index, cell in enumerate(sources):
+            if distance[cell]:
+                distance[cell] = 0
+                owner[cell] = player_index
+                heap.append((0, cell))
+        heapq.heapify(heap)
+
+        neighbours = self.neighbours
+        while heap:
+            dist, cell = heapq.heappop(heap)
+            if dist > distance[cell]:
+                continue
+            for neighbour, cost in neighbours[cell]:
+                new = dist + cost
+                if new < distance[neighbour]:
+                    distance[neighbour] = new
+                    next_cell[neighbour] = cell
+                    owner[neighbour] = owner[cell]
+                    heapq.heappush(heap, (new, neighbour))
+
+        centers = self.centers
+        for cell, target in enumerate(next_cell):
+            if target >= 0:
+                dx = centers[target][0] - centers[cell][0]
+                dy = centers[target][1] - centers[cell][1]
+                length = math.hypot(dx, dy)
+                vectors[cell] = (dx / length, dy / length)
+
+        self.distance, self.vectors, self.owner = distance, vectors, owner
+        if np is not None:
+            # NaN marks cells without a stored vector, steering() looks those up one by one
+            self.vector_array = np.array([vector or (math.nan, math.nan) for vector in vectors])
+            self.owner_array = np.array(owner, dtype=np.int64)
+        self.builds += 1
+
+    def sample(self, x, y):
+        """(steering unit vector, player it leads to) at (x, y), ((0, 0), None) without players"""
+        cell = self.cell_index(x, y)
+        owner = self.owner[cell]
+        if owner < 0:
+            return NO_STEERING, None
+        vector = self.vectors[cell]
+        if vector is None:
+            vector = self._goal_vector(cell, x, y)
+        return vector, self.players[owner]
+
+    def _goal_vector(self, cell, x, y):
+        goal_x, goal_y = self.goals[cell]
+        dx, dy = goal_x - x, goal_y - y
+        length = math.sqrt(dx * dx + dy * dy)
+        return (dx / length, dy / length) if length >= 1 else NO_STEERING
+
+    def steering(self, agents, radius, weight):
+        """(vectors, target players) of agents: the field direction plus weighted
+        separation within radius, scaled down to unit length when longer.
+
+        With NumPy every agent is sampled and combined as array operations,
+        with the same result as the per agent pass.
+        """
+        centers = [agent.rect.center for agent in agents]
+        if np is not None and centers and self.owner_array is not None:
+            return self._steering_arrays(centers, radius, weight)
+        pushes = _separation_lists(centers, radius) if weight else None
+        vectors, targets = [], []
+        for index, (x, y) in enumerate(centers):
+            (vx, vy), target = self.sample(x, y)
+            if pushes is not None:
+                push_x, push_y = pushes[index]
+                vx += push_x * weight
+                vy += push_y * weight
+                length = math.sqrt(vx * vx + vy * vy)
+                if length > 1:
+                    vx, vy = vx / length, vy / length
+            vectors.append((vx, vy))
+            targets.append(target)
+        return vectors, targets
+
+    def _steering_arrays(self, centers, radius, weight):
+        points = np.array(centers, dtype=np.int64)
+        cols = np.clip(points[:, 0] // self.cell_size, 0, self.cols - 1)
+        rows = np.clip(points[:, 1] // self.cell_size, 0, self.rows - 1)
+        cells = rows * self.cols + cols
+        owner = self.owner_array[cells]
+        vx, vy = self.vector_array[cells].T.copy()
+        unowned = owner < 0
+        vx[unowned] = vy[unowned] = 0.0
+        # Agents in a player's cell steer at the player itself, a handful at most
+        for row in np.flatnonzero(np.isnan(vx)).tolist():
+            vx[row], vy[row] = self._goal_vector(int(cells[row]), *centers[row])
+
+        if weight:
+            push_x, push_y = _separation_arrays(points, radius)
+            vx += push_x * weight
+            vy += push_y * weight
+            length = np.sqrt(vx * vx + vy * vy)
+            longer = length > 1
+            vx[longer] /= length[longer]
+            vy[longer] /= length[longer]
+        players = self.players
+        targets = [players[index] if index >= 0 else None for index in owner.tolist()]
+        return list(zip(vx.tolist(), vy.tolist())), targets
+
+
+def separation_vectors(agents, radius):
+    """Per agent push away from neighbours closer than radius, stronger when closer.
+
+    Centers are binned into radius sized cells, so only the 3x3 cells around
+    an agent can hold neighbours in range. With NumPy the pairs are found and
+    summed as array operations, in the same order and with the same result
+    as the pure Python pass.
+    """
+    centers = [agent.rect.center for agent in agents]
+    if np is None or not centers:
+        return _separation_lists(centers, radius)
+    push_x, push_y = _separation_arrays(np.array(centers, dtype=np.int64), radius)
+    return list(zip(push_x.tolist(), push_y.tolist()))
+
+
+def _separation_lists(centers, radius):
+    cells = {}
+    for index, (x, y) in enumerate(centers):
+        key = (x // radius, y // radius)
+        bucket = cells.get(key)
+        if bucket is None:
+            cells[key] = [index]
+        else:
+            bucket.append(index)
+
+    pushes = []
+    for index, (x, y) in enumerate(centers):
+        col, row = x // radius, y // radius
+        push_x = push_y = 0.0
+        for dx_cell, dy_cell in CELL_OFFSETS:
+            for other in cells.get((col + dx_cell, row + dy_cell), ()):
+                if other == index:
+                    continue
+                ox, oy = centers[other]
+                dx, dy = x - ox, y - oy
+                dist = math.sqrt(dx * dx + dy * dy)
+                if dist >= radius:
+                    continue
+                if dist == 0:
+                    # Stacked exactly, split them apart by list order
+                    dx, dy, dist = (1.0 if index < other else -1.0), 0.0, 1.0
+                strength = 1 - dist / radius
+                push_x += dx / dist * strength
+                push_y += dy / dist * strength
+        pushes.append((push_x, push_y))
+    return pushes
+
+
+def _separation_arrays(points, radius):
+    count = len(points)
+    cells = (points // radius).astype(np.int64)
+    cells -= cells.min(axis=0) - 1  # one empty cell of margin on every side
+    width = int(cells[:, 0].max()) + 2
+    keys = cells[:, 1] * width + cells[:, 0]
+    order = np.argsort(keys, kind="stable")  # agents of a cell stay in list order
+    cell_sizes = np.bincount(keys, minlength=(int(cells[:, 1].max()) + 2) * width)
+    cell_starts = np.cumsum(cell_sizes) - cell_sizes  # first position of a cell in order
+
+    # Candidate pairs (agent, other) of the 3x3 cells around every agent, agent by
+    # agent in the loop order of the Python pass, so the sums below match it exactly
+    offsets = np.array([dy_cell * width + dx_cell for dx_cell, dy_cell in CELL_OFFSETS])
+    wanted = (keys[:, None] + offsets).ravel()
+    sizes = cell_sizes[wanted]
+    total = int(sizes.sum())
+    first = np.cumsum(sizes) - sizes
+    agent = np.repeat(np.arange(count), sizes.reshape(count, len(offsets)).sum(axis=1))
+    other = order[np.repeat(cell_starts[wanted] - first, sizes) + np.arange(total)]
+    dx = points[agent, 0] - points[other, 0]
+    dy = points[agent, 1] - points[other, 1]
+    squared = dx * dx + dy * dy
+    close = (squared < radius * radius) & (agent != other)
+    agent, other = agent[close], other[close]
+    dx = dx[close].astype(np.float64)
+    dy = dy[close].astype(np.float64)
+    dist = np.sqrt(squared[close].astype(np.float64))
+    stacked = dist == 0
+    dx[stacked] = np.where(agent[stacked] < other[stacked], 1.0, -1.0)
+    dist[stacked] = 1.0
+    strength = 1 - dist / radius
+    push_x = np.bincount(agent, weights=dx / dist * strength, minlength=count)
+    push_y = np.bincount(agent, weights=dy / dist * strength, minlength=count)
+    return push_x, push_y
@@ -9,7 +9,21 @@ from inputs import InputManager, PLAYER_KEYMAPS
 from player import Player
 from enemy_unicorns import UnicornEnemy
 from assets import Assets
-from config import GAME_FPS
+from asset_cache import ASSET_CACHE
+from config import (GAME_FPS, RENDER_FPS, RENDER_INTERPOLATION, MAX_FRAME_TIME,
+                    RENDER_THREAD, BULLET_ENGINE, BULLET_POOL_SIZE, NPC_POOL_SIZE, WIN_SCORE,
+                    NPC_STEERING, SEPARATION_RADIUS, SEPARATION_WEIGHT, NPC_UPDATE)
+from game_clock import DEFAULT_CLOCK
+from spatial import SpatialHash, TargetIndex
+from flowfield import FlowField
+from npc_engine import create_npc_updater
+from scheduler import Scheduler
+from pipeline import run_pipelined
+from profiler import FrameProfiler
+from text_cache import TEXT_CACHE
+from renderer import create_renderer
+from bullet_engine import create_bullet_store
+from pool import ObjectPool
 
 ENEMY_SPAWN_ORDER = [
     (0, 10, [UnicornEnemy]),
@@ -20,30 +34,69 @@ ENEMY_SPAWN_ORDER = [
 class AbstractGame:
     def __init__(self, **kwargs):
         self.screen = kwargs["screen"]  # ✅ MUST be set before using
+        self.game_clock = kwargs.get("clock") or DEFAULT_CLOCK
         self.input_manager = InputManager()
 
-        # ✅ Load and scale background
-        bg_path = os.path.join("assets", "sprites", "background", "heli.png")
-        original_bg = pygame.image.load(bg_path).convert()
-        screen_width = self.screen.get_width()
-        screen_height = self.screen.get_height()
-        self.background = pygame.transform.scale(original_bg, (screen_width, screen_height))
+        # All gameplay randomness comes from this generator so a seed reproduces a match
+        self.seed = kwargs.get("seed")
+        if self.seed is None:
+            self.seed = random.randrange(1 << 32)
+        self.rng = random.Random(self.seed)
+        self.recorder = kwargs.get("recorder")
+
+        # ✅ Load and scale background, unless the caller already did
+        self.background = kwargs.get("background")
+        if self.background is None:
+            bg_path = os.path.join("assets", "sprites", "background", "heli.png")
+            self.background = ASSET_CACHE.image(bg_path, size=self.screen.get_size(), alpha=False)
 
         self.clock = pygame.time.Clock()
+        self.profiler = kwargs.get("profiler") or FrameProfiler()
+        self.renderer = kwargs.get("renderer") or create_renderer()
         self.running = True
-        self.tick = 1 * GAME_FPS
+        self.sim_dt = 1000 // kwargs.get("sim_fps", GAME_FPS)  # ms per simulation tick
+        self.render_fps = kwargs.get("render_fps", RENDER_FPS)
+        self.interpolate = kwargs.get("interpolate", RENDER_INTERPOLATION)
+        self.max_frame_time = kwargs.get("max_frame_time", MAX_FRAME_TIME)
+        self.previous_positions = {}  # eid -> rect topleft before the last tick
+        self.render_thread = kwargs.get("render_thread", RENDER_THREAD)
         self.players = {}
         self.npcs = []
 
         self.bullets = []
-        self.player_bullets = []
-        self.npc_bullets = []
-
-        self.npc_last_shot_times = {}
-        self.npc_shoot_cooldown = 500
+        self.bullet_pool = ObjectPool(Bullet, kwargs.get("bullet_pool_size", BULLET_POOL_SIZE))
+        self.npc_pool_size = kwargs.get("npc_pool_size", NPC_POOL_SIZE)
+        self.npc_pools = {}
+
+        self.bullet_engine = kwargs.get("bullet_engine") or BULLET_ENGINE
+        self.player_bullets = create_bullet_store(self.bullet_engine, self.bullet_pool.release)
+        self.npc_bullets = create_bullet_store(self.bullet_engine, self.bullet_pool.release)
+
+        self.collision_grid = SpatialHash()
+        self.player_index = TargetIndex()
+        self.npc_index = TargetIndex()
+        self.npc_steering = kwargs.get("npc_steering") or NPC_STEERING
+        self.flow_field = FlowField() if self.npc_steering == "flowfield" else None
+        self.separation_weight = kwargs.get("separation_weight", SEPARATION_WEIGHT)
+        self.npc_update = kwargs.get("npc_update") or NPC_UPDATE
+        self.npc_batch = create_npc_updater(self.npc_update)
+
+        # Cooldowns, spawns and animation frames wake up through timers on the game clock
+        self.timers = Scheduler()
+        self.npc_shot_ready = set()  # NPCs whose shoot cooldown has run out
+        self.spawn_timer = None
+
+        # Balancing knobs, see balance.py
+        self.npc_shoot_cooldown = kwargs.get("npc_shoot_cooldown", 500)
+        self.spawn_order = kwargs.get("spawn_order", ENEMY_SPAWN_ORDER)
+        self.win_score = kwargs.get("win_score", WIN_SCORE)
         self.score = 0
-        self.last_spawn_time = pygame.time.get_ticks()
-        self.spawn_interval_range = (3000, 5000)
+        self.score_surface = None
+        self.score_surface_value = None
+        self.last_spawn_time = self.game_clock.now()
+        self.spawn_interval_range = tuple(kwargs.get("spawn_interval_range", (3000, 5000)))
+        self.next_spawn_interval = self.rng.randint(*self.spawn_interval_range)
+        self.schedule_spawn()
         self.game_result = None
 
     def spawn_random_npc(self):
@@ -55,76 +108,131 @@ class AbstractGame:
             (margin, sh - margin),
             (sw - margin, sh - margin),
         ]
-        x, y = random.choice(corners)
+        x, y = self.rng.choice(corners)
 
-        for min_score, max_score, enemy_classes in ENEMY_SPAWN_ORDER:
+        for min_score, max_score, enemy_classes in self.spawn_order:
             if min_score <= self.score < max_score:
-                enemy_cls = random.choice(enemy_classes)
-                self.npcs.append(enemy_cls(x, y))
+                enemy_cls = self.rng.choice(enemy_classes)
+                self.npcs.append(self.acquire_npc(enemy_cls, x, y))
                 break
 
-    def try_spawn_npc(self):
-        now = pygame.time.get_ticks()
-        if now - self.last_spawn_time > self.next_spawn_interval:
-            self.spawn_random_npc()
-            self.last_spawn_time = now
-            self.next_spawn_interval = random.randint(*self.spawn_interval_range)
-
-    def try_npc_shoot(self, npc):
-        now = pygame.time.get_ticks()
-        npc_id = id(npc)
+    def acquire_npc(self, enemy_cls, x, y):
+        """New or recycled enemy of enemy_cls from its pool, with its timers registered"""
+        pool = self.npc_pools.get(enemy_cls)
+        if pool is None:
+            pool = self.npc_pools[enemy_cls] = ObjectPool(enemy_cls, self.npc_pool_size)
+        npc = pool.acquire(x, y, clock=self.game_clock)
+        if self.npc_batch is None:  # the batch strategy keeps its own timers in arrays
+            # Matches the old "never shot" cooldown of last shot at time 0
+            self.timers.call_at(self.npc_shoot_cooldown, self.npc_shot_ready.add, npc, owner=npc)
+            npc.scheduled_frames = True
+            self.timers.call_at(npc.next_frame_at(), self.advance_npc_frame, npc, owner=npc)
+        return npc
+
+    def advance_npc_frame(self, npc):
+        """Frame timer callback, keeps itself scheduled while the enemy lives"""
+        npc.advance_frame(self.game_clock.now())
+        self.timers.call_at(npc.next_frame_at(), self.advance_npc_frame, npc, owner=npc)
+
+    def release_npc(self, npc):
+        """Hands a removed enemy back to its pool, cancelling its timers"""
+        self.timers.cancel_owner(npc)
+        self.npc_shot_ready.discard(npc)
+        pool = self.npc_pools.get(type(npc))
+        if pool is not None:
+            pool.release(npc)
+
+    def remove_dead_npcs(self):
+        """Drops NPCs without health, recycling them"""
+        remaining = []
+        for npc in self.npcs:
+            if npc.health > 0:
+                remaining.append(npc)
+            else:
+                self.release_npc(npc)
+        self.npcs[:] = remaining
+
+    def pool_stats(self):
+        """Pool statistics by pool name"""
+        stats = {"bullets": self.bullet_pool.stats()}
+        for enemy_cls, pool in self.npc_pools.items():
+            stats[enemy_cls.__name__] = pool.stats()
+        return stats
+
+    def run_timers(self):
+        """Fires spawn, cooldown and animation timers due this tick"""
+        self.timers.run_due(self.game_clock.now())
+
+    def schedule_spawn(self):
+        """(Re)schedules the next spawn from last_spawn_time and next_spawn_interval"""
+        if self.spawn_timer is not None:
+            self.timers.cancel(self.spawn_timer)
+        # The first tick strictly after the interval, like the old polling check
+        deadline = self.last_spawn_time + self.next_spawn_interval + 1
+        self.spawn_timer = self.timers.call_at(deadline, self.spawn_due)
+
+    def spawn_due(self):
+        """Spawn timer callback"""
+        self.spawn_timer = None
+        self.spawn_random_npc()
+        self.last_spawn_time = self.game_clock.now()
+        self.next_spawn_interval = self.rng.randint(*self.spawn_interval_range)
+        self.schedule_spawn()
 
-        if now - self.npc_last_shot_times.get(npc_id, 0) < self.npc_shoot_cooldown:
+    def try_npc_shoot(self, npc, target=None):
+        if npc not in self.npc_shot_ready:
             return
 
-        target = npc.get_shot_target([p for p in self.players.values() if p.health > 0])
+        if target is None:
+            target = npc.get_shot_target([p for p in self.players.values() if p.health > 0])
         if not target:
             return
 
+        self.fire_npc_bullet(npc, target)
+        self.npc_shot_ready.discard(npc)
+        self.timers.call_at(self.game_clock.now() + self.npc_shoot_cooldown,
+                            self.npc_shot_ready.add, npc, owner=npc)
+
+    def fire_npc_bullet(self, npc, target):
+        """Spawns a bullet from npc at target, cooldowns are up to the caller"""
         bullet_image = getattr(npc, "bullet_image", None)
-        bullet = Bullet(
+        bullet = self.bullet_pool.acquire(
             npc.rect.centerx, npc.rect.centery,
             target.rect.centerx, target.rect.centery,
             shooter=npc,
             image=bullet_image if bullet_image else None,
+            rotations=getattr(npc, "bullet_rotations", None),
             color=(255, 0, 0) if not bullet_image else (0, 0, 0)  # backup only
         )
-
-
         self.npc_bullets.append(bullet)
-        self.npc_last_shot_times[npc_id] = now
 
     def check_bullet_collisions(self):
-        for bullet in self.npc_bullets[:]:
-            for npc in self.npcs:
-                if bullet.shooter == npc:
-                    for player in self.players.values():
-                        if bullet.rect.colliderect(player.rect):
-                            player.health -= npc.damage
-                            self.npc_bullets.remove(bullet)
-                            break
-                    break
-
-        for bullet in self.player_bullets[:]:
-            for npc in self.npcs[:]:
-                if bullet.rect.colliderect(npc.rect):
-                    npc.health -= player.damage
-                    if npc.health <= 0:
-                        self.npcs.remove(npc)
-                        self.score += npc.score
-                    self.player_bullets.remove(bullet)
-                    break
+        living_players = [p for p in self.players.values() if p.health > 0]
+        self.npc_bullets.collide(living_players, self.on_player_hit, self.collision_grid)
+        self.player_bullets.collide(self.npcs, self.on_npc_hit, self.collision_grid)
+        self.remove_dead_npcs()
+
+    def on_player_hit(self, bullet, player):
+        player.health -= bullet.damage
+
+    def on_npc_hit(self, bullet, npc):
+        npc.health -= bullet.damage
+        if npc.health <= 0:
+            self.score += npc.score
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 print("Pressed quitting!")
                 self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle()
 
     def handle_key_events(self):
         raise NotImplementedError
 
     def update_players(self, **kwargs):
+        self.npc_index.build(self.npcs)
         for player in self.players.values():
             if player.health <= 0:
                 continue
@@ -133,80 +241,202 @@ class AbstractGame:
             player.update(inputs=inputs, **kwargs)
 
             if KeyType.SHOOT.name in inputs:
-                bullet = player.shoot(self.npcs)
+                bullet = player.shoot(self.npcs, target_index=self.npc_index,
+                                      bullet_factory=self.bullet_pool.acquire)
                 if bullet is not None:
                     self.player_bullets.append(bullet)
 
             self.input_manager.clear_inputs(player.uid)
 
     def update_npcs(self, **kwargs):
-        for npc in self.npcs[:]:
-            npc.update(players=self.players, **kwargs)
-            self.try_npc_shoot(npc)
-
-            for player in self.players.values():
-                if player.health <= 0:
-                    continue
-
-                if npc.rect.colliderect(player.rect):
-                    player.health -= npc.damage * 2
-                    self.npcs.remove(npc)
-                    break
-
-    def render_all(self):
-        self.screen.blit(self.background, (0, 0))
-
-        for player in self.players.values():
-            if player.health > 0:
-                player.draw(self.screen)
-
+        living_players = [p for p in self.players.values() if p.health > 0]
+        if self.npc_batch is not None:
+            self.npc_batch.update(self, living_players)
+        elif self.flow_field is not None:
+            self.steer_npcs(living_players)
+        else:
+            self.player_index.build(living_players)
+            targets = self.player_index.nearest_for_all(self.npcs)
+            for npc, target in zip(self.npcs, targets):
+                npc.update(players=self.players, target=target, **kwargs)
+                if target is not None:
+                    self.try_npc_shoot(npc, target)
+
+        # Contact damage, each NPC touching a living player dies on impact
+        if self.npc_batch is not None:
+            contacts = self.npc_batch.contacts(self.npcs, living_players)
+        else:
+            grid = self.collision_grid.build(living_players)
+            contacts = []
+            for npc in self.npcs:
+                hits = grid.query(npc.rect)
+                if hits:
+                    contacts.append((npc, hits[0]))
+        if contacts:
+            for npc, player in contacts:
+                player.health -= npc.damage * 2
+                self.release_npc(npc)
+            dead = {id(npc) for npc, _ in contacts}
+            self.npcs[:] = [npc for npc in self.npcs if id(npc) not in dead]
+
+    def steer_npcs(self, living_players):
+        """Moves NPCs along the shared flow field, pushed apart by separation"""
+        field = self.flow_field
+        field.update(living_players)
+        vectors, targets = field.steering(self.npcs, SEPARATION_RADIUS, self.separation_weight)
+        for npc, (vx, vy), target in zip(self.npcs, vectors, targets):
+            npc.steer(vx, vy)
+            if target is not None:
+                self.try_npc_shoot(npc, target)
+
+    def capture_positions(self):
+        """Remembers player and NPC positions before a tick for interpolated rendering"""
+        positions = {player.eid: player.rect.topleft for player in self.players.values()}
         for npc in self.npcs:
-            npc.draw(self.screen)
-
-        for bullet in self.player_bullets:
-            bullet.draw(self.screen)
-
-        for bullet in self.npc_bullets:
-            bullet.draw(self.screen)
-
-        font = pygame.font.SysFont(None, 30)
-        score_surface = font.render(f"Score: {self.score}", True, (255, 255, 255))
-        self.screen.blit(score_surface, (10, 10))
+            positions[npc.eid] = npc.rect.topleft
+        self.previous_positions = positions
+
+    def draw_entity(self, entity, alpha, previous):
+        """Draws a player or NPC alpha of the way from its previous to its current position"""
+        rect = entity.rect
+        start = previous.get(entity.eid) if alpha < 1.0 else None
+        current = rect.topleft
+        if start is None or start == current:
+            return entity.draw(self.screen)
+        # Moved only for drawing, the simulation never sees the interpolated rect
+        rect.topleft = (start[0] + round((current[0] - start[0]) * alpha),
+                        start[1] + round((current[1] - start[1]) * alpha))
+        try:
+            return entity.draw(self.screen)
+        finally:
+            rect.topleft = current
+
+    def render_all(self, alpha=1.0):
+        """Draws the current state, alpha < 1 interpolates from the previous tick"""
+        living = [player for player in self.players.values() if player.health > 0]
+        self.draw_scene(living, self.npcs, (self.player_bullets, self.npc_bullets), self.score,
+                        alpha, self.previous_positions)
+
+    def draw_scene(self, players, npcs, bullet_stores, score, alpha=1.0, previous=None):
+        """Draws entities, bullets and score, from the live game or from a frame snapshot"""
+        renderer = self.renderer
+        renderer.begin(self.screen, self.background)
+        previous = previous or {}
+
+        for player in players:
+            renderer.add(self.draw_entity(player, alpha, previous))
+
+        for npc in npcs:
+            renderer.add(self.draw_entity(npc, alpha, previous))
+
+        for bullets in bullet_stores:
+            for area in bullets.draw(self.screen, 1.0 - alpha):
+                renderer.add(area)
+
+        # Score text is rendered again only when the score changes
+        if self.score_surface_value != score:
+            self.score_surface = TEXT_CACHE.render(f"Score: {score}", 30, (255, 255, 255))
+            self.score_surface_value = score
+        renderer.add(self.screen.blit(self.score_surface, (10, 10)))
+        renderer.add(self.profiler.draw(self.screen, (self.score_surface.get_width() + 30, 10)))
+        renderer.end()
 
     def update_bullets(self):
-        for bullet_list in [self.player_bullets, self.npc_bullets]:
-            for bullet in bullet_list[:]:
-                bullet.update()
-                if bullet.is_off_screen():
-                    bullet_list.remove(bullet)
+        self.player_bullets.update()
+        self.npc_bullets.update()
 
     def check_game_end(self):
         alive_players = [p for p in self.players.values() if p.health > 0]
         if not alive_players:
-            if self.score >= 200:
+            if self.score >= self.win_score:
                 self.game_result = "win"
             else:
                 self.game_result = "lost"
             self.running = False
 
-    def run(self):
-        self.next_spawn_interval = random.randint(*self.spawn_interval_range)
-        while self.running:
-            self.handle_events()
-            self.handle_key_events()
-            self.try_spawn_npc()
+    def simulate(self):
+        """Simulation part of a tick that runs before rendering"""
+        profiler = self.profiler
+        with profiler.phase("timers"):
+            self.run_timers()
+        with profiler.phase("players"):
             self.update_players()
+        with profiler.phase("npcs"):
             self.update_npcs()
+        with profiler.phase("bullets"):
             self.update_bullets()
-            self.render_all()
-            pygame.display.flip()
-            self.clock.tick(self.tick)
+
+    def resolve(self):
+        """Simulation part of a tick that runs after rendering"""
+        with self.profiler.phase("collisions"):
             self.check_bullet_collisions()
-            self.check_game_end()
+        self.check_game_end()
+
+    def end_frame(self):
+        """Hands entity counts of the finished frame to the profiler"""
+        if self.profiler.enabled:
+            self.profiler.end_frame(
+                players=sum(1 for p in self.players.values() if p.health > 0),
+                npcs=len(self.npcs),
+                bullets=len(self.player_bullets) + len(self.npc_bullets),
+            )
+
+    def step(self):
+        """One whole simulation tick without input polling or rendering"""
+        self.simulate()
+        self.resolve()
+
+    def sim_tick(self):
+        """One fixed simulation tick of the interactive loop, collisions included"""
+        with self.profiler.phase("input"):
+            self.handle_key_events()
+        if self.recorder is not None:
+            self.recorder.capture_inputs(self)
+        self.simulate()
+        self.game_clock.advance(self.sim_dt)
+        if self.recorder is not None:
+            self.recorder.end_tick(self.sim_dt)
+        self.resolve()
 
+    def run(self):
+        """Plays until the game ends, returns the result"""
+        if self.render_thread:
+            run_pipelined(self)
+        else:
+            self.run_frames()
+
+        if self.recorder is not None:
+            self.recorder.finish(self)
+        self.profiler.close()
         print("Closing game ....")
         return self.game_result
 
+    def run_frames(self):
+        """Fixed-timestep loop: real time accumulates and is spent in whole sim_dt ticks,
+        every frame is rendered in between the last two ticks"""
+        profiler = self.profiler
+        accumulator = self.sim_dt  # the first frame runs one tick
+        self.clock.tick()
+        while self.running:
+            profiler.begin_frame()
+            with profiler.phase("input"):
+                self.handle_events()
+            while accumulator >= self.sim_dt and self.running:
+                accumulator -= self.sim_dt
+                if accumulator < self.sim_dt and self.interpolate:
+                    self.capture_positions()
+                self.sim_tick()
+            alpha = accumulator / self.sim_dt if self.interpolate else 1.0
+            with profiler.phase("render"):
+                self.render_all(alpha)
+            with profiler.phase("flip"):
+                self.renderer.present()
+            with profiler.phase("idle"):
+                elapsed = self.clock.tick(self.render_fps)
+            # Slower than real time after a long stall rather than a burst of catch-up ticks
+            accumulator += min(elapsed, self.max_frame_time)
+            self.end_frame()
+
 
 class SingleGame(AbstractGame):
     PLAYER1 = "Player1"
@@ -214,11 +444,11 @@ class SingleGame(AbstractGame):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        self.assets = Assets()
+        self.assets = kwargs.get("assets") or Assets()
         center_x = self.screen.get_width() // 2
         center_y = self.screen.get_height() // 2
 
-        pl1 = Player(self.PLAYER1, assets=self.assets)
+        pl1 = Player(self.PLAYER1, assets=self.assets, clock=self.game_clock)
         pl1.set_coords(center_x - 30, center_y)
         self.players[self.PLAYER1] = pl1
         self.input_manager.add_keymap(self.PLAYER1, PLAYER_KEYMAPS["wasd"])
@@ -239,16 +469,16 @@ class CoopGame(AbstractGame):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-        self.assets = Assets()
+        self.assets = kwargs.get("assets") or Assets()
         center_x = self.screen.get_width() // 2
         center_y = self.screen.get_height() // 2
 
-        pl1 = Player(self.PLAYER1, assets=self.assets)
+        pl1 = Player(self.PLAYER1, assets=self.assets, clock=self.game_clock)
         pl1.set_coords(center_x - 30, center_y)
         self.players[self.PLAYER1] = pl1
         self.input_manager.add_keymap(self.PLAYER1, PLAYER_KEYMAPS["wasd"])
 
-        pl2 = Player(self.PLAYER2, assets=self.assets)
+        pl2 = Player(self.PLAYER2, assets=self.assets, clock=self.game_clock)
         pl2.set_coords(center_x + 30, center_y)
         pl2.color = (0, 0, 255)
         self.players[self.PLAYER2] = pl2
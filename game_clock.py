@@ -0,0 +1,31 @@
+"""Game clock module"""
+import pygame
+
+
+class RealClock:
+    """Wall clock in ms, backed by pygame ticks"""
+
+    def now(self):
+        """Current game time in ms"""
+        return pygame.time.get_ticks()
+
+    def advance(self, dt):
+        """Real time advances on its own"""
+
+
+class FixedClock:
+    """Manually advanced clock for headless and deterministic runs"""
+
+    def __init__(self, start=0):
+        self.ticks = start
+
+    def now(self):
+        """Current game time in ms"""
+        return self.ticks
+
+    def advance(self, dt):
+        """Moves game time forward by dt ms"""
+        self.ticks += dt
+
+
+DEFAULT_CLOCK = RealClock()
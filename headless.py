@@ -0,0 +1,149 @@
+"""Headless simulation module"""
+import argparse
+import os
+import random
+import time
+
+import pygame
+
+from config import GAME_FPS, SCREEN_WIDTH, SCREEN_HEIGHT
+from enums import GameType, KeyType
+from assets import Assets
+from atlas import install_atlas
+from game import AbstractGame, SingleGame, CoopGame
+from game_clock import FixedClock
+from player import Player
+
+BOT_MOVES = [KeyType.UP.name, KeyType.DOWN.name, KeyType.LEFT.name, KeyType.RIGHT.name]
+
+
+def headless_screen():
+    """Display surface on the SDL dummy driver, nothing is shown"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.get_surface()
+    if screen is None:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    install_atlas()
+    return screen
+
+
+class RandomBot:
+    """Input source: random walk while shooting for every player"""
+
+    def __init__(self, seed=None, turn_every=10):
+        self.rng = random.Random(seed)
+        self.turn_every = turn_every
+        self.moves = {}
+
+    def __call__(self, game, tick):
+        for uid in game.players:
+            if tick % self.turn_every == 0 or uid not in self.moves:
+                self.moves[uid] = self.rng.choice(BOT_MOVES)
+            game.input_manager.add_inputs(uid, [self.moves[uid], KeyType.SHOOT.name])
+
+
+class BotGame(AbstractGame):
+    """Game with any number of players driven only by injected inputs"""
+
+    def __init__(self, player_count=1, **kwargs):
+        super().__init__(**kwargs)
+
+        self.assets = Assets()
+        center_x = self.screen.get_width() // 2
+        center_y = self.screen.get_height() // 2
+        for index in range(player_count):
+            uid = f"Bot{index + 1}"
+            player = Player(uid, assets=self.assets, clock=self.game_clock)
+            player.set_coords(center_x + (index - player_count // 2) * 60, center_y)
+            self.players[uid] = player
+
+        self.spawn_random_npc()
+
+    def handle_key_events(self):
+        """Bots have no keyboard, inputs come from add_inputs"""
+
+
+class HeadlessRunner:
+    """Steps any AbstractGame on a fixed timestep clock as fast as the CPU allows"""
+
+    def __init__(self, game_cls, dt=1000 // GAME_FPS, input_source=None, render_every=0,
+                 **game_kwargs):
+        self.dt = dt
+        self.input_source = input_source
+        self.render_every = render_every
+        self.clock = FixedClock()
+        self.tick = 0
+        self.game = game_cls(screen=headless_screen(), clock=self.clock, **game_kwargs)
+
+    def step(self, count=1):
+        """Runs up to count ticks, stops early when the game ends"""
+        game = self.game
+        profiler = game.profiler
+        for _ in range(count):
+            if not game.running:
+                break
+            profiler.begin_frame()
+            if self.input_source is not None:
+                with profiler.phase("input"):
+                    self.input_source(game, self.tick)
+            if game.recorder is not None:
+                game.recorder.capture_inputs(game)
+            game.simulate()
+            if self.render_every and self.tick % self.render_every == 0:
+                with profiler.phase("render"):
+                    game.render_all()
+            self.clock.advance(self.dt)
+            if game.recorder is not None:
+                game.recorder.end_tick(self.dt)
+            game.resolve()
+            game.end_frame()
+            self.tick += 1
+        return game.running
+
+    def run(self, ticks):
+        """Runs ticks ticks and reports simulation speed"""
+        start_tick = self.tick
+        start = time.perf_counter()
+        self.step(ticks)
+        elapsed = time.perf_counter() - start
+        done = self.tick - start_tick
+        return {
+            "ticks": done,
+            "seconds": elapsed,
+            "ticks_per_second": done / elapsed if elapsed else float("inf"),
+            "realtime_factor": done * self.dt / 1000 / elapsed if elapsed else float("inf"),
+            "result": self.game.game_result,
+            "score": self.game.score,
+        }
+
+
+def main():
+    """Headless runner CLI"""
+    parser = argparse.ArgumentParser(description="Run the game without a display")
+    parser.add_argument("--mode", choices=[t.value for t in GameType], default=GameType.SINGLE)
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--dt", type=int, default=1000 // GAME_FPS, help="ms per tick")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--render-every", type=int, default=0)
+    parser.add_argument("--record", help="write seed and inputs to this recording file")
+    args = parser.parse_args()
+
+    recorder = None
+    if args.record:
+        from replay import InputRecorder  # pylint: disable=import-outside-toplevel
+        recorder = InputRecorder(args.record)
+    game_cls = SingleGame if args.mode == GameType.SINGLE else CoopGame
+    runner = HeadlessRunner(game_cls, dt=args.dt, input_source=RandomBot(args.seed),
+                            render_every=args.render_every, seed=args.seed, recorder=recorder)
+    stats = runner.run(args.ticks)
+    if recorder is not None:
+        recorder.finish(runner.game)
+    print(f"{stats['ticks']} ticks in {stats['seconds']:.2f} s: "
+          f"{stats['ticks_per_second']:.0f} ticks/s ({stats['realtime_factor']:.1f}x realtime), "
+          f"result={stats['result']} score={stats['score']}")
+
+
+if __name__ == "__main__":
+    main()
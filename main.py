@@ -1,37 +1,102 @@
 """Main module"""
 
+import argparse
 import sys
 import os
 sys.path.append(os.path.dirname(__file__))  # ✅ Ensures local imports work
 
+# Imported first, so the imports below can be timed
+from startup import StartupProfile  # pylint: disable=wrong-import-position
+STARTUP = StartupProfile(enabled="--startup-profile" in sys.argv)
+STARTUP.watch_imports(__name__)
+
+# Only what the splash screen needs, the game modules are imported once a mode is picked
+# pylint: disable=wrong-import-position
 import pygame
 
+from asset_cache import ASSET_CACHE
+from atlas import install_atlas
 from enums import GameType
-from game import SingleGame, CoopGame
-from ui import show_menu, show_splash, show_end_message
-from config import SCREEN_WIDTH, SCREEN_HEIGHT  # ✅ Use screen resolution from config
+from game_clock import FixedClock
+from preload import AssetPreloader
+from ui import show_menu, show_splash, draw_splash, show_end_message
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, ATLAS_ENABLED  # ✅ Use screen resolution from config
+# pylint: enable=wrong-import-position
+STARTUP.stop_imports()
+
+
+def init_pygame():
+    """Initializes only the pygame subsystems the game uses.
+
+    pygame.init() would also open the audio device and scan for joysticks.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    pygame.time.Clock()  # starts the SDL timer behind pygame.time.get_ticks()
+
+def match_kwargs(path, match):
+    """Game kwargs of a match, recorded to path numbered from the second match on"""
+    # Game time advances by whole simulation ticks, independent of the frame rate,
+    # which also makes recordings replay exactly
+    kwargs = {"clock": FixedClock(pygame.time.get_ticks())}
+    if not path:
+        return kwargs
+    from replay import InputRecorder  # pylint: disable=import-outside-toplevel
+    if match > 1:
+        root, ext = os.path.splitext(path)
+        path = f"{root}.{match}{ext}"
+    kwargs["recorder"] = InputRecorder(path)
+    return kwargs
+
 
 def main():
     """Main function of this game"""
+    parser = argparse.ArgumentParser(description="Unicorn Zombies")
+    parser.add_argument("--record", help="record every match to this file for replay.py")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print where the time until the first splash frame goes and exit")
+    args = parser.parse_args()
 
-    pygame.init()
+    with STARTUP.step("pygame display, font and timer init"):
+        init_pygame()
 
     # Set up window using fixed resolution from config.py
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("UNICORN ZOMBIES")
+    with STARTUP.step("display.set_mode"):
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("UNICORN ZOMBIES")
 
-    # Load and scale background to match config resolution
-    bg_path = os.path.join("assets", "sprites", "background", "heli.png")
-    raw_bg = pygame.image.load(bg_path).convert()
-    background = pygame.transform.scale(raw_bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    # Every scaled sprite and background comes from the pre-baked atlas when it
+    # is up to date, anything else is decoded by the preloader behind splash and menu
+    with STARTUP.step("install_atlas"):
+        atlas_ready = install_atlas(rebuild=False)
+    with STARTUP.step("start asset preloader"):
+        preloader = AssetPreloader(rebuild_atlas=ATLAS_ENABLED and not atlas_ready).start()
 
-    show_splash(screen)
+    with STARTUP.step("first splash frame"):
+        draw_splash(screen)
+    if args.startup_profile:
+        print("\n".join(STARTUP.report()))
+        pygame.quit()
+        return
 
+    show_splash(screen, preloader, drawn=True)
+
+    match = 0
     while True:
-        choice = show_menu(screen)
+        choice = show_menu(screen, preloader)
+        if choice == "quit":
+            break
+        match += 1
+
+        # Only waits for what the preloader has not finished during the menu
+        assets = preloader.finish()
+        from game import SingleGame, CoopGame  # pylint: disable=import-outside-toplevel
+        bg_path = os.path.join("assets", "sprites", "background", "heli.png")
+        background = ASSET_CACHE.image(bg_path, size=(SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
 
         if choice == GameType.SINGLE:
-            game = SingleGame(screen=screen, background=background)
+            game = SingleGame(screen=screen, background=background, assets=assets,
+                              **match_kwargs(args.record, match))
             result = game.run()
             if result == "win":
                 show_end_message(screen, f"You win! Score: {game.score}")
@@ -39,7 +104,8 @@ def main():
                 show_end_message(screen, f"You lost. Score: {game.score}")
 
         elif choice == GameType.COOP:
-            game = CoopGame(screen=screen, background=background)
+            game = CoopGame(screen=screen, background=background, assets=assets,
+                            **match_kwargs(args.record, match))
             result = game.run()
             if result == "win":
                 show_end_message(screen, f"You win! Score: {game.score}")
@@ -48,9 +114,6 @@ def main():
             else:
                 show_end_message(screen, "Game ended.")
 
-        elif choice == "quit":
-            break
-
     pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+"""Batch NPC update module"""
+from config import NPC_UPDATE
+
+try:
+    import numpy as np
+except ImportError:  # optional, only the "numpy" strategy needs it
+    np = None
+
+DIRECTIONS = ["down", "left", "right", "up"]
+ACTIONS = ["idle", "move"]
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+DOWN, LEFT, RIGHT, UP = range(4)
+IDLE, MOVE = range(2)
+ARRIVE_DISTANCE = 2  # px per axis within which an NPC stops chasing
+
+
+def rect_step(edge, step):
+    """Whole pixels a Rect edge at edge moves by rect.x += step, pygame rounds half away from 0"""
+    moved = edge + step
+    return np.trunc(moved + np.copysign(0.5, moved)) - edge
+
+
+class NpcBatch:
+    """NPC state in NumPy arrays, moved, animated and fired as batch operations.
+
+    Rows follow the order of game.npcs and are matched to enemies by entity
+    id, so pooled enemies start a fresh row on every spawn. Every enemy
+    chases its nearest living player like UnicornEnemy.update, using the
+    speed and frame delay of its type. Positions stay on whole pixels and
+    steps are rounded like a pygame Rect move, so both strategies walk the
+    same paths; rects are written back every tick.
+    """
+
+    FIELDS = ("eid", "x", "y", "width", "height", "speed", "frame_delay", "frame_timer",
+              "frame_index", "direction", "action", "last_shot", "kind")
+
+    def __init__(self):
+        self.types = {}  # enemy class -> kind code
+        self.type_list = []
+        self.frame_counts = np.ones((0, len(DIRECTIONS), len(ACTIONS)), dtype=np.int64)
+        self.eid = np.zeros(0, dtype=np.int64)
+        self.x = np.zeros(0)  # rect center
+        self.y = np.zeros(0)
+        self.width = np.zeros(0, dtype=np.int64)  # rect size, changes with the image
+        self.height = np.zeros(0, dtype=np.int64)
+        self.speed = np.zeros(0)
+        self.frame_delay = np.zeros(0)
+        self.frame_timer = np.zeros(0)
+        self.frame_index = np.zeros(0, dtype=np.int64)
+        self.direction = np.zeros(0, dtype=np.int64)
+        self.action = np.zeros(0, dtype=np.int64)
+        self.last_shot = np.zeros(0)
+        self.kind = np.zeros(0, dtype=np.int64)
+
+    def _kind(self, cls):
+        kind = self.types.get(cls)
+        if kind is None:
+            kind = self.types[cls] = len(self.type_list)
+            self.type_list.append(cls)
+            counts = np.ones((1, len(DIRECTIONS), len(ACTIONS)), dtype=np.int64)
+            for direction, d in DIRECTION_CODES.items():
+                for action, a in ACTION_CODES.items():
+                    counts[0, d, a] = max(1, len(cls.animations.get((direction, action), ())))
+            self.frame_counts = np.concatenate([self.frame_counts, counts])
+        return kind
+
+    def sync(self, npcs):
+        """Aligns rows with npcs, keeping state of known enemies and adding new ones"""
+        # Pooled enemies come back as the same objects, only their eids tell spawns apart
+        if len(npcs) == len(self.eid) and [npc.eid for npc in npcs] == self.eid.tolist():
+            return
+        rows = {eid: row for row, eid in enumerate(self.eid.tolist())}
+        old = np.array([rows.get(npc.eid, -1) for npc in npcs], dtype=np.int64)
+        keep = old >= 0
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            fresh = np.zeros(len(npcs), dtype=array.dtype)
+            fresh[keep] = array[old[keep]]
+            setattr(self, name, fresh)
+
+        for row in np.flatnonzero(~keep).tolist():
+            npc = npcs[row]
+            cls = type(npc)
+            self.eid[row] = npc.eid
+            self.x[row], self.y[row] = npc.rect.center
+            self.width[row], self.height[row] = npc.rect.size
+            self.speed[row] = npc.speed
+            self.frame_delay[row] = npc.frame_delay
+            self.frame_timer[row] = npc.frame_timer
+            self.frame_index[row] = npc.frame_index
+            self.direction[row] = DIRECTION_CODES.get(npc.direction, DOWN)
+            self.action[row] = ACTION_CODES.get(npc.action, IDLE)
+            self.last_shot[row] = 0
+            self.kind[row] = self._kind(cls)
+
+    def update(self, game, living_players):
+        """Moves, animates and fires every NPC of game, replaces the per-object loop"""
+        npcs = game.npcs
+        self.sync(npcs)
+        if not npcs or not living_players:
+            return
+
+        now = game.game_clock.now()
+        health = np.fromiter((npc.health for npc in npcs), dtype=np.float64, count=len(npcs))
+        alive = health > 0
+
+        # Nearest living player by center distance, players are few so a full matrix is fine
+        px = np.array([p.rect.centerx for p in living_players], dtype=np.float64)
+        py = np.array([p.rect.centery for p in living_players], dtype=np.float64)
+        x, y = self.x, self.y
+        distance = (x[:, None] - px[None, :]) ** 2 + (y[:, None] - py[None, :]) ** 2
+        target = distance.argmin(axis=1)
+        dx = px[target] - np.rint(x)
+        dy = py[target] - np.rint(y)
+
+        # Direction and movement, same rules as UnicornEnemy.update
+        direction = np.where(np.abs(dx) > np.abs(dy),
+                             np.where(dx > 0, RIGHT, LEFT), np.where(dy > 0, DOWN, UP))
+        moving = alive & ((np.abs(dx) > ARRIVE_DISTANCE) | (np.abs(dy) > ARRIVE_DISTANCE))
+        speed = self.speed
+        x += np.where(moving, rect_step(x - self.width // 2, np.where(dx > 0, speed, -speed)), 0)
+        y += np.where(moving, rect_step(y - self.height // 2, np.where(dy > 0, speed, -speed)), 0)
+        action = np.where(moving, MOVE, IDLE)
+
+        # Frame advance
+        advance = alive & (now - self.frame_timer > self.frame_delay)
+        frames = self.frame_counts[self.kind, direction, action]
+        frame_index = np.where(advance, (self.frame_index + 1) % frames, self.frame_index)
+        self.frame_timer = np.where(advance, now, self.frame_timer)
+        changed = alive & ((direction != self.direction) | (action != self.action) |
+                           (frame_index != self.frame_index))
+        self.direction = np.where(alive, direction, self.direction)
+        self.action = np.where(alive, action, self.action)
+        self.frame_index = frame_index
+
+        for row in np.flatnonzero(changed).tolist():
+            npc = npcs[row]
+            npc.direction = DIRECTIONS[self.direction[row]]
+            npc.action = ACTIONS[self.action[row]]
+            npc.frame_index = int(self.frame_index[row])
+            npc.frame_timer = self.frame_timer[row]
+            images = npc.animations.get((npc.direction, npc.action))
+            if images:
+                npc.image = images[npc.frame_index % len(images)]
+                npc.rect.size = self.width[row], self.height[row] = npc.image.get_size()
+
+        for npc, cx, cy in zip(npcs, np.rint(x).astype(np.int64).tolist(),
+                               np.rint(y).astype(np.int64).tolist()):
+            npc.rect.center = (cx, cy)
+
+        # Shoot cooldowns
+        ready = alive & (now - self.last_shot >= game.npc_shoot_cooldown)
+        for row in np.flatnonzero(ready).tolist():
+            game.fire_npc_bullet(npcs[row], living_players[target[row]])
+        self.last_shot[ready] = now
+
+    def contacts(self, npcs, players):
+        """(npc, first player in list order whose rect it overlaps) pairs, like a
+        SpatialHash query per npc but as one NPC x player array test"""
+        self.sync(npcs)
+        if not npcs or not players:
+            return []
+        rects = np.array([tuple(p.rect) for p in players], dtype=np.int64)
+        left = np.rint(self.x).astype(np.int64) - self.width // 2
+        top = np.rint(self.y).astype(np.int64) - self.height // 2
+        overlap = ((left[:, None] < rects[None, :, 0] + rects[None, :, 2]) &
+                   (left[:, None] + self.width[:, None] > rects[None, :, 0]) &
+                   (top[:, None] < rects[None, :, 1] + rects[None, :, 3]) &
+                   (top[:, None] + self.height[:, None] > rects[None, :, 1]))
+        rows = np.flatnonzero(overlap.any(axis=1))
+        first = overlap[rows].argmax(axis=1)
+        return [(npcs[row], players[index]) for row, index in zip(rows.tolist(), first.tolist())]
+
+
+def create_npc_updater(strategy=NPC_UPDATE):
+    """Batch updater of the strategy selected in config, None for per-object updates"""
+    if strategy == "numpy":
+        if np is not None:
+            return NpcBatch()
+        print("[WARN] NumPy is not installed, falling back to per-object NPC updates")
+    return None
@@ -0,0 +1,176 @@
+"""Threaded simulation / rendering pipeline module
+
+The simulation runs on a worker thread and publishes an immutable frame
+snapshot after every tick. The main thread keeps the window, events and
+drawing, SDL expects those on the thread that created the display, and
+draws the latest snapshot interpolated from the one before. pygame releases
+the GIL inside blits, fills and flips, so drawing one frame overlaps with
+simulating the next tick on a multi-core machine.
+"""
+import threading
+import time
+
+
+class FrameSnapshot:
+    """Everything drawn in one frame, captured right after a tick.
+
+    Players and NPCs are draw_copy() copies, bullets BulletSnapshots, so the
+    simulation may change or recycle the originals while this is drawn.
+    """
+
+    __slots__ = ("tick", "time", "players", "npcs", "bullets", "score")
+
+    def __init__(self, tick, players, npcs, bullets, score):
+        self.tick = tick
+        self.time = time.perf_counter()
+        self.players = players
+        self.npcs = npcs
+        self.bullets = bullets
+        self.score = score
+
+    def positions(self):
+        """eid -> rect topleft of every player and NPC"""
+        positions = {player.eid: player.rect.topleft for player in self.players}
+        for npc in self.npcs:
+            positions[npc.eid] = npc.rect.topleft
+        return positions
+
+
+def capture_frame(game, tick):
+    """FrameSnapshot of the current game state"""
+    return FrameSnapshot(
+        tick,
+        tuple(player.draw_copy() for player in game.players.values() if player.health > 0),
+        tuple(npc.draw_copy() for npc in game.npcs),
+        (game.player_bullets.snapshot(), game.npc_bullets.snapshot()),
+        game.score,
+    )
+
+
+class SnapshotBuffer:
+    """Double buffer of the two newest snapshots, written by one thread, read by another.
+
+    Snapshots are never modified after publish(), so swapping references
+    under the lock is all the synchronization drawing needs.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.previous = None
+        self.latest = None
+        self.closed = False
+
+    def publish(self, snapshot):
+        """Makes snapshot the latest, the former latest becomes previous"""
+        with self.condition:
+            self.previous = self.latest
+            self.latest = snapshot
+            self.condition.notify_all()
+
+    def close(self):
+        """No more snapshots will follow"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def read(self):
+        """(previous, latest) snapshots, previous may be None"""
+        with self.condition:
+            return self.previous, self.latest
+
+    def wait_newer(self, snapshot, timeout=None):
+        """Blocks until a snapshot other than snapshot is published or the buffer closes"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.latest is not snapshot or self.closed, timeout)
+            return self.previous, self.latest
+
+
+class SimulationThread(threading.Thread):
+    """Steps a game at its fixed tick rate and publishes a snapshot after every tick.
+
+    With paced=False ticks run back to back, e.g. to measure throughput.
+    """
+
+    def __init__(self, game, buffer, paced=True, max_ticks=None):
+        super().__init__(name="simulation", daemon=True)
+        self.game = game
+        self.buffer = buffer
+        self.paced = paced
+        self.max_ticks = max_ticks
+        self.ticks = 0
+        self.error = None
+
+    def run(self):
+        game = self.game
+        profiler = game.profiler
+        interval = game.sim_dt / 1000
+        next_tick = time.perf_counter()
+        try:
+            while game.running and (self.max_ticks is None or self.ticks < self.max_ticks):
+                profiler.begin_frame()
+                game.sim_tick()
+                game.end_frame()
+                self.ticks += 1
+                self.buffer.publish(capture_frame(game, self.ticks))
+                if not self.paced:
+                    continue
+                next_tick += interval
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif -delay > game.max_frame_time / 1000:
+                    next_tick = time.perf_counter()  # slower than real time instead of catching up
+        except BaseException as e:  # pylint: disable=broad-exception-caught
+            self.error = e  # re-raised on the rendering thread
+            game.running = False
+        finally:
+            self.buffer.close()
+
+
+def draw_frame(game, previous, latest, alpha):
+    """Draws latest, interpolated from previous by alpha, on the game screen"""
+    game.draw_scene(latest.players, latest.npcs, latest.bullets, latest.score, alpha,
+                    previous.positions() if previous is not None and alpha < 1.0 else None)
+
+
+def run_pipelined(game):
+    """Runs a game with the simulation on a SimulationThread until it ends.
+
+    The calling thread handles events, draws the newest snapshot as often as
+    game.render_fps allows and presents it.
+    """
+    profiler = game.profiler
+    buffer = SnapshotBuffer()
+    buffer.publish(capture_frame(game, 0))
+    simulation = SimulationThread(game, buffer)
+    simulation.start()
+
+    interval = game.sim_dt / 1000
+    drawn = None
+    game.clock.tick()
+    while True:
+        # The simulation thread owns the profiler frame, these go to its shared phases
+        with profiler.shared_phase("input"):
+            game.handle_events()
+        if game.interpolate:
+            previous, latest = buffer.read()
+        else:
+            # Without interpolation a frame only changes with a new snapshot
+            previous, latest = buffer.wait_newer(drawn, interval)
+        if buffer.closed and latest is drawn:
+            break
+        alpha = 1.0
+        if game.interpolate and previous is not None:
+            # One tick behind the simulation, moving from previous towards latest
+            alpha = min(1.0, (time.perf_counter() - latest.time) / interval)
+        with profiler.shared_phase("render"):
+            draw_frame(game, previous, latest, alpha)
+        with profiler.shared_phase("flip"):
+            game.renderer.present()
+        drawn = latest
+        game.clock.tick(game.render_fps)
+
+    simulation.join()
+    if simulation.error is not None:
+        raise simulation.error
+    return simulation.ticks
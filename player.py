@@ -5,36 +5,48 @@ import pygame
 from config import PLAYER_WIDTH, PLAYER_HEIGHT, PLAYER_SPEED, SCREEN_WIDTH, SCREEN_HEIGHT
 from enums import KeyType, Facing
 from bullet import Bullet
+from game_clock import DEFAULT_CLOCK
+from entity_ids import next_entity_id
+from text_cache import TEXT_CACHE
 
 movement_keys = {KeyType.LEFT.name, KeyType.RIGHT.name, KeyType.UP.name, KeyType.DOWN.name}
 
 
 class Player:
-    def __init__(self, uid, assets, pos=(0, 0)):
+    __slots__ = ("eid", "uid", "clock", "assets", "frames", "image", "rect", "name",
+                 "is_moving", "facing", "health", "max_health", "color", "last_shot_time",
+                 "frame_timer", "frame_index", "current_action", "last_shoot_anim", "shooting")
+
+    # Prototype stats, shared by all players
+    base_health = 100
+    speed = PLAYER_SPEED
+    shoot_cooldown = 250
+    damage = 10  # damage dealt per shot
+    frame_delay = 150  # ms
+    shoot_anim_time = 300  # ms to show shoot frame
+
+    def __init__(self, uid, assets, pos=(0, 0), clock=None):
+        self.eid = next_entity_id()
         self.uid = uid
+        self.clock = clock or DEFAULT_CLOCK
         self.assets = assets
         self.frames = self.assets.player_frames  # Dict: (direction, action) -> [Surface]
         self.image = None
         self.rect = pygame.Rect(pos[0], pos[1], PLAYER_WIDTH, PLAYER_HEIGHT)
 
         self.name = uid
-        self.speed = PLAYER_SPEED
         self.is_moving = False
         self.facing = Facing.DOWN
-        self.health = 100
-        self.max_health = 100
+        self.health = self.base_health
+        self.max_health = self.base_health
         self.color = (0, 255, 0)
 
-        self.shoot_cooldown = 250
-        self.damage = 10  # damage dealt per shot
-        self.last_shot_time = pygame.time.get_ticks()
+        self.last_shot_time = self.clock.now()
 
         self.frame_timer = 0
         self.frame_index = 0
-        self.frame_delay = 150  # ms
         self.current_action = "walk1"
 
-        self.shoot_anim_time = 300  # ms to show shoot frame
         self.last_shoot_anim = 0
         self.shooting = False  # Tracks if we are currently animating a shot
 
@@ -69,7 +81,7 @@ class Player:
         self.animate()
 
     def animate(self):
-        now = pygame.time.get_ticks()
+        now = self.clock.now()
         direction = self.facing.name.lower()
 
         if self.shooting:
@@ -80,8 +92,7 @@ class Player:
                 key = (direction, frame)
                 self.image = self.frames.get(key, self.frames.get(("down", "walk1"), [None]))[0]
                 if self.image:
-                    center = self.rect.center
-                    self.rect = self.image.get_rect(center=center)
+                    self.fit_rect()
                 return
 
         if self.is_moving:
@@ -95,8 +106,13 @@ class Player:
         self.image = self.frames.get(key, self.frames.get(("down", "walk1"), [None]))[0]
 
         if self.image:
-            center = self.rect.center
-            self.rect = self.image.get_rect(center=center)
+            self.fit_rect()
+
+    def fit_rect(self):
+        """Resizes rect in place to the current image, keeping its center"""
+        center = self.rect.center
+        self.rect.size = self.image.get_size()
+        self.rect.center = center
 
     def distance(self, rect1, rect2):
         return math.hypot(rect1.centerx - rect2.centerx, rect1.centery - rect2.centery)
@@ -111,14 +127,18 @@ class Player:
                 closest = npc
         return closest
 
-    def shoot(self, npcs):
-        now = pygame.time.get_ticks()
+    def shoot(self, npcs, target_index=None, bullet_factory=Bullet):
+        now = self.clock.now()
         if now - self.last_shot_time >= self.shoot_cooldown:
-            target = self.find_closest_npc(npcs)
+            if target_index is not None:
+                target = target_index.nearest_one(*self.rect.center)
+            else:
+                target = self.find_closest_npc(npcs)
             if target is None:
                 return None
             target_pos = (target.rect.centerx, target.rect.centery - 8)
-            bullet = Bullet(self.rect.centerx, self.rect.centery, *target_pos, color=self.color)
+            bullet = bullet_factory(self.rect.centerx, self.rect.centery, *target_pos,
+                                    color=self.color, shooter=self)
 
             self.last_shot_time = now
             self.shooting = True
@@ -126,22 +146,35 @@ class Player:
 
             return bullet
 
+    def draw_copy(self):
+        """Detached copy with just the state draw() reads, drawable while the original moves on"""
+        copy = object.__new__(Player)
+        copy.eid = self.eid
+        copy.image = self.image
+        copy.rect = self.rect.copy()
+        copy.health = self.health
+        copy.max_health = self.max_health
+        copy.name = self.name
+        copy.color = self.color
+        return copy
+
     def draw_lifebar(self, screen):
         bar_width = self.rect.width
         bar_height = 5
         fill = (self.health / self.max_health) * bar_width
         offset = 5
-        pygame.draw.rect(screen, (255, 0, 0), (self.rect.x + offset, self.rect.y - 10, bar_width, bar_height))
-        pygame.draw.rect(screen, (0, 255, 0), (self.rect.x + offset, self.rect.y - 10, fill, bar_height))
+        area = pygame.draw.rect(screen, (255, 0, 0),
+                                (self.rect.x + offset, self.rect.y - 10, bar_width, bar_height))
+        pygame.draw.rect(screen, (0, 255, 0),
+                         (self.rect.x + offset, self.rect.y - 10, fill, bar_height))
 
-        font = pygame.font.SysFont(None, 24)
-        name_surface = font.render(self.name, True, self.color)
+        name_surface = TEXT_CACHE.render(self.name, 24, self.color)
         name_rect = name_surface.get_rect(center=(self.rect.centerx + offset, self.rect.top - 20))
-        screen.blit(name_surface, name_rect)
+        return area.union(screen.blit(name_surface, name_rect))
 
     def draw(self, screen):
         if self.image:
-            screen.blit(self.image, self.rect)
+            area = screen.blit(self.image, self.rect)
         else:
-            pygame.draw.rect(screen, self.color, self.rect)
-        self.draw_lifebar(screen)
\ No newline at end of file
+            area = pygame.draw.rect(screen, self.color, self.rect)
+        return area.union(self.draw_lifebar(screen))
\ No newline at end of file
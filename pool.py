@@ -0,0 +1,51 @@
+"""Object pooling module"""
+
+
+class ObjectPool:
+    """Free list of reusable objects.
+
+    Pooled classes take the same arguments in __init__ and reset(), reset()
+    must bring a used object back to a freshly constructed state.
+    """
+
+    def __init__(self, factory, max_size):
+        self.factory = factory
+        self.max_size = max_size
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0
+        self.created = 0
+        self.reused = 0
+        self.dropped = 0
+
+    def acquire(self, *args, **kwargs):
+        """Reset object from the free list, or a new one when empty"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.created += 1
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return obj
+
+    def release(self, obj):
+        """Returns an object for reuse, kept only while the pool is below max_size"""
+        self.in_use -= 1
+        if len(self.free) < self.max_size:
+            self.free.append(obj)
+        else:
+            self.dropped += 1
+
+    def stats(self):
+        """Allocation counters and high-water mark of objects in use"""
+        return {
+            "in_use": self.in_use,
+            "free": len(self.free),
+            "high_water": self.high_water,
+            "created": self.created,
+            "reused": self.reused,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,115 @@
+"""Background asset preloading module"""
+import queue
+import threading
+
+import pygame
+
+from asset_cache import ASSET_CACHE
+from assets import Assets
+from atlas import ATLAS_ENTRIES, build_atlas, entry_key, render_entry
+
+
+class AssetPreloader:
+    """Decodes and scales assets on a worker thread while splash and menu run.
+
+    The worker only produces unconverted Surfaces, SDL display calls stay on
+    the main thread: poll() converts finished entries to the display format
+    and stores them in the cache. Entries already cached, e.g. from the
+    texture atlas, are skipped. With rebuild_atlas the worker also writes a
+    fresh atlas from the decoded frames for the next start.
+    """
+
+    def __init__(self, entries=ATLAS_ENTRIES, cache=ASSET_CACHE, rebuild_atlas=False):
+        self.cache = cache
+        self.entries = list(entries)
+        self.pending = [entry for entry in self.entries if entry_key(entry) not in cache]
+        self.rebuild_atlas = rebuild_atlas
+        self.total = len(self.pending)
+        self.done = 0
+        self.results = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._work, name="asset-preloader", daemon=True)
+        self.assets = None  # shared Assets, ready once everything is loaded
+
+    def start(self):
+        """Starts the worker, returns self"""
+        self.thread.start()
+        return self
+
+    @property
+    def progress(self):
+        """Share of finished entries, 0.0 - 1.0"""
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def ready(self):
+        """Everything is loaded and the prepared objects exist"""
+        return self.assets is not None
+
+    def _work(self):
+        rendered = []
+        for entry in self.entries:
+            key = entry_key(entry)
+            wanted = entry in self.pending
+            # Loaded meanwhile by the main thread, e.g. the splash background
+            if key in self.cache and not self.rebuild_atlas:
+                if wanted:
+                    self.results.put((key, None, None))
+                continue
+            try:
+                frames = render_entry(entry)
+            except (OSError, pygame.error) as e:
+                if wanted:
+                    self.results.put((key, None, e))
+                self.rebuild_atlas = False
+                continue
+            rendered.append(frames)
+            if wanted:
+                self.results.put((key, frames, None))
+
+        if self.rebuild_atlas:
+            try:
+                build_atlas(self.entries, frames=rendered)
+            except (OSError, pygame.error) as e:
+                print(f"[WARN] Could not rebuild the texture atlas: {e}")
+
+    def poll(self, block=False):
+        """Converts and caches entries finished so far, returns progress"""
+        while self.done < self.total:
+            try:
+                key, frames, error = self.results.get(block=block)
+            except queue.Empty:
+                break
+            self.done += 1
+            if error is not None:
+                # The entry is loaded lazily again on first use and fails there
+                print(f"[WARN] Preloading {key[1]} failed: {error}")
+            elif frames is not None and key not in self.cache:
+                self.cache.put(key, self._convert(key, frames))
+
+        if self.done == self.total and self.assets is None:
+            self._prepare()
+        return self.progress
+
+    def finish(self):
+        """Waits for every entry, returns the shared Assets"""
+        while not self.ready:
+            self.poll(block=True)
+        return self.assets
+
+    @staticmethod
+    def _convert(key, frames):
+        if key[0] == "grid":
+            cols, rows = key[2], key[3]
+            frames = [frame.convert_alpha() for frame in frames]
+            return [frames[row * cols:(row + 1) * cols] for row in range(rows)]
+        alpha = key[4]
+        return frames[0].convert_alpha() if alpha else frames[0].convert()
+
+    def _prepare(self):
+        # Everything built from cached Surfaces, e.g. rotation tables and enemy prototypes.
+        # The game modules are imported here, after the splash screen is up
+        from game import ENEMY_SPAWN_ORDER  # pylint: disable=import-outside-toplevel
+        for _, _, enemy_types in ENEMY_SPAWN_ORDER:
+            for enemy_type in enemy_types:
+                enemy_type.ensure_prototype()
+        self.assets = Assets()
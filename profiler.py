@@ -0,0 +1,207 @@
+"""Frame profiling module"""
+import contextlib
+import gc
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+from config import PROFILER_ENABLED, PROFILER_WINDOW, PROFILER_SINK
+from text_cache import TEXT_CACHE
+
+PHASES = ["input", "timers", "players", "npcs", "bullets", "render", "flip", "collisions"]
+NULL_PHASE = contextlib.nullcontext()
+OVERLAY_REFRESH = 10  # frames between overlay text updates
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class _Phase:
+    """Context manager adding elapsed time of its block to a frame"""
+    __slots__ = ("frame", "name", "start")
+
+    def __init__(self, frame, name):
+        self.frame = frame
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1e3
+        self.frame[self.name] = self.frame.get(self.name, 0.0) + elapsed
+        return False
+
+
+class _SharedPhase:
+    """Context manager adding elapsed time of its block to the shared frame of a profiler"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1e3
+        profiler = self.profiler
+        with profiler.lock:
+            shared = profiler.shared_frame
+            shared[self.name] = shared.get(self.name, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:
+    """Rolling per-phase frame timings, entity and allocation counts.
+
+    While disabled, phase() returns a shared no-op context manager and the
+    frame hooks return immediately. phase() belongs to the thread calling
+    begin_frame() / end_frame(). Other threads, e.g. rendering beside a
+    simulation thread, time their blocks with shared_phase(); those add up
+    under a lock until the next end_frame() and are recorded separately.
+    """
+
+    def __init__(self, enabled=PROFILER_ENABLED, window=PROFILER_WINDOW, sink_path=PROFILER_SINK):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {name: deque(maxlen=window) for name in PHASES + ["frame"]}
+        self.counts = {}
+        self.frame = {}
+        self.shared_frame = {}  # shared_phase() times since the last end_frame()
+        self.lock = threading.Lock()
+        self.frame_number = 0
+        self.frame_start = None  # None until begin_frame() of the current frame ran
+        self.blocks = 0
+        self.collections = 0
+        self.allocations = deque(maxlen=window)
+        self.sink_path = sink_path
+        self.sink = None
+        self.lines = []
+
+    def toggle(self):
+        """Switches profiling and the overlay on or off"""
+        self.enabled = not self.enabled
+        if self.enabled:
+            # Enabled mid-frame, nothing is recorded until the next begin_frame()
+            self.frame = {}
+            self.frame_start = None
+            with self.lock:
+                self.shared_frame = {}
+        else:
+            self.close()
+
+    def phase(self, name):
+        """Context manager timing one phase of the current frame"""
+        if not self.enabled:
+            return NULL_PHASE
+        return _Phase(self.frame, name)
+
+    def shared_phase(self, name):
+        """Context manager timing one phase on a thread other than the frame's"""
+        if not self.enabled:
+            return NULL_PHASE
+        return _SharedPhase(self, name)
+
+    def begin_frame(self):
+        """Marks frame start"""
+        if not self.enabled:
+            return
+        self.frame = {}
+        self.blocks = sys.getallocatedblocks()
+        self.collections = gc.get_stats()[0]["collections"]
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self, **counts):
+        """Stores timings of the finished frame along with entity counts"""
+        if not self.enabled or self.frame_start is None:
+            return
+        # Waiting for the next frame is not part of the frame budget
+        frame_ms = (time.perf_counter() - self.frame_start) * 1e3 - self.frame.get("idle", 0.0)
+        allocated = sys.getallocatedblocks() - self.blocks
+        collections = gc.get_stats()[0]["collections"] - self.collections
+        with self.lock:
+            shared, self.shared_frame = self.shared_frame, {}
+
+        for name in PHASES:
+            self.samples[name].append(self.frame.get(name, 0.0) + shared.get(name, 0.0))
+        self.samples["frame"].append(frame_ms)
+        self.allocations.append(allocated)
+        self.counts = counts
+        self.frame_number += 1
+
+        if self.sink_path:
+            with self.lock:  # close() may run on another thread
+                self._write(frame_ms, allocated, collections, shared)
+
+    def stats(self, name):
+        """p50 / p95 / p99 in ms of one phase over the rolling window"""
+        values = sorted(self.samples[name])
+        return {
+            "p50": percentile(values, 0.50),
+            "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99),
+        }
+
+    def report(self):
+        """Text lines with percentiles of every phase"""
+        lines = ["phase        p50    p95    p99 ms"]
+        for name in PHASES + ["frame"]:
+            stats = self.stats(name)
+            lines.append(f"{name:<10}{stats['p50']:>6.2f} {stats['p95']:>6.2f} "
+                         f"{stats['p99']:>6.2f}")
+        counts = " ".join(f"{key}={value}" for key, value in self.counts.items())
+        allocs = sum(self.allocations) / len(self.allocations) if self.allocations else 0
+        lines.append(counts)
+        lines.append(f"net alloc blocks/frame {allocs:+.0f}")
+        return lines
+
+    def draw(self, screen, pos=(160, 10)):
+        """Overlay with the report drawn next to the score, returns its area"""
+        if not self.enabled:
+            return None
+        # Numbers change every refresh, so lines bypass the text surface cache
+        if self.frame_number % OVERLAY_REFRESH == 0 or not self.lines:
+            font = TEXT_CACHE.font("monospace", 14)
+            self.lines = [font.render(line, True, (255, 255, 0)) for line in self.report()]
+
+        x, y = pos
+        area = None
+        for surface in self.lines:
+            rect = screen.blit(surface, (x, y))
+            area = rect if area is None else area.union(rect)
+            y += surface.get_height()
+        return area
+
+    def close(self):
+        """Closes the JSONL sink"""
+        with self.lock:
+            if self.sink is not None:
+                self.sink.close()
+                self.sink = None
+
+    def _write(self, frame_ms, allocated, collections, shared):
+        if self.sink is None:
+            self.sink = open(self.sink_path, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+        record = {
+            "frame": self.frame_number,
+            "frame_ms": round(frame_ms, 3),
+            "phases": {name: round(ms, 3) for name, ms in self.frame.items()},
+            "shared_phases": {name: round(ms, 3) for name, ms in shared.items()},
+            "counts": self.counts,
+            "alloc_blocks": allocated,
+            "gc_collections": collections,
+        }
+        self.sink.write(json.dumps(record) + "\n")
@@ -0,0 +1,83 @@
+"""Network protocol module
+
+Every frame is a 4 byte big-endian length, a 1 byte frame type and the
+payload. Payloads are UTF-8 JSON unless noted otherwise.
+STATE payloads are binary snapshots, see snapshot.py.
+"""
+import json
+import struct
+
+from enums import KeyType
+
+HEADER = struct.Struct("!IB")
+ACK_PAYLOAD = struct.Struct("!I")
+MAX_FRAME = 1 << 20
+
+HELLO = 1    # client -> server, {"name": str}
+WELCOME = 2  # server -> client, {"uid": str, "id": int, "fps": int}
+INPUT = 3    # client -> server, [KeyType name, ...] for one tick
+STATE = 4    # server -> client, full or delta snapshot
+BYE = 5      # either side, connection is closing
+ACK = 6      # client -> server, u32 tick of the last decoded snapshot
+
+KEY_NAMES = frozenset(key.name for key in KeyType)
+
+
+class ProtocolError(Exception):
+    """Malformed or unexpected frame"""
+
+
+def encode_frame(kind, payload=b""):
+    """Frame bytes of a raw payload"""
+    return HEADER.pack(len(payload) + 1, kind) + payload
+
+
+def encode_json(kind, data):
+    """Frame bytes of a JSON payload"""
+    return encode_frame(kind, json.dumps(data, separators=(",", ":")).encode())
+
+
+def decode_json(payload):
+    """Decoded JSON payload"""
+    try:
+        return json.loads(payload)
+    except ValueError as e:
+        raise ProtocolError(f"Invalid JSON payload: {e}") from e
+
+
+def encode_ack(tick):
+    """Frame bytes acknowledging the snapshot of tick"""
+    return encode_frame(ACK, ACK_PAYLOAD.pack(tick))
+
+
+def parse_ack(payload):
+    """Acknowledged tick of an ACK frame"""
+    if len(payload) != ACK_PAYLOAD.size:
+        raise ProtocolError("Invalid ACK frame")
+    return ACK_PAYLOAD.unpack(payload)[0]
+
+
+async def read_frame(reader):
+    """(kind, payload) of the next frame, raises IncompleteReadError on disconnect"""
+    header = await reader.readexactly(HEADER.size)
+    length, kind = HEADER.unpack(header)
+    if not 1 <= length <= MAX_FRAME:
+        raise ProtocolError(f"Invalid frame length {length}")
+    payload = await reader.readexactly(length - 1)
+    return kind, payload
+
+
+def parse_hello(payload):
+    """Validated player name of a HELLO frame"""
+    hello = decode_json(payload)
+    if not isinstance(hello, dict):
+        raise ProtocolError("Hello frame must be an object")
+    return str(hello.get("name", "player"))[:16]
+
+
+def parse_inputs(payload):
+    """Validated KeyType names of an INPUT frame"""
+    keys = decode_json(payload)
+    if not isinstance(keys, list):
+        raise ProtocolError("Input frame must be a list")
+    return [key for key in keys if isinstance(key, str) and key in KEY_NAMES]
@@ -0,0 +1,92 @@
+"""Screen presentation module"""
+import pygame
+
+from config import DIRTY_RECT_RENDERING, DIRTY_RECT_MAX_FRACTION
+
+
+class FullRenderer:
+    """Redraws the whole background and flips the whole display every frame"""
+
+    def begin(self, screen, background):
+        """Clears the screen with the background"""
+        screen.blit(background, (0, 0))
+
+    def add(self, rect):
+        """Every pixel is pushed anyway"""
+
+    def end(self):
+        """Nothing to track"""
+
+    def invalidate(self):
+        """Every frame is a full redraw already"""
+
+    def present(self):
+        """Pushes the frame to the display"""
+        pygame.display.flip()
+
+
+class DirtyRectRenderer:
+    """Restores and pushes only the areas drawn in this or the previous frame.
+
+    Falls back to a full flip when the dirty area exceeds max_fraction of
+    the screen, where one large update is cheaper than many small ones.
+    """
+
+    def __init__(self, max_fraction=DIRTY_RECT_MAX_FRACTION):
+        self.max_fraction = max_fraction
+        self.previous = []
+        self.current = []
+        self.pending = None
+        self.bounds = None
+        self.full_redraw = True
+        self.full_flips = 0
+        self.partial_updates = 0
+
+    def begin(self, screen, background):
+        """Restores the background under everything drawn last frame"""
+        self.bounds = screen.get_rect()
+        if self.full_redraw:
+            screen.blit(background, (0, 0))
+        else:
+            for rect in self.previous:
+                screen.blit(background, rect, rect)
+        self.current = []
+
+    def add(self, rect):
+        """Marks an area drawn in this frame"""
+        if rect is None:
+            return
+        rect = rect.clip(self.bounds)
+        if rect.width and rect.height:
+            self.current.append(rect)
+
+    def end(self):
+        """Closes the frame, present() then pushes its dirty areas"""
+        if self.full_redraw:
+            self.pending = None
+        else:
+            dirty = self.previous + self.current
+            area = sum(rect.width * rect.height for rect in dirty)
+            limit = self.bounds.width * self.bounds.height * self.max_fraction
+            self.pending = dirty if area <= limit else None
+        self.previous = self.current
+        self.full_redraw = False
+
+    def invalidate(self):
+        """Forces a full redraw next frame, e.g. after something drew over the screen"""
+        self.full_redraw = True
+
+    def present(self):
+        """Pushes dirty areas, or the whole frame when too much changed"""
+        if self.pending is None:
+            self.full_flips += 1
+            pygame.display.flip()
+        else:
+            self.partial_updates += 1
+            pygame.display.update(self.pending)
+        self.pending = None
+
+
+def create_renderer():
+    """Renderer selected in config"""
+    return DirtyRectRenderer() if DIRTY_RECT_RENDERING else FullRenderer()
@@ -0,0 +1,213 @@
+"""Input recording and replay module
+
+A recording is a gzip stream: magic, u32 length and a JSON header (game
+type, player uids, seed, clock start, engines), then one record per
+tick with the u16 ms the clock advanced and one KeyType bitmask byte per
+player. An end marker is followed by the SHA-256 of the final game state.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import struct
+import time
+
+from enums import KeyType
+from game import SingleGame, CoopGame
+from game_clock import FixedClock
+from headless import BotGame, headless_screen
+
+MAGIC = b"UZR1"
+LENGTH = struct.Struct("<I")
+END_MARKER = 0xFFFF
+DT = struct.Struct("<H")
+KEY_BITS = {key.name: 1 << index for index, key in enumerate(KeyType)}
+GAME_TYPES = {cls.__name__: cls for cls in (SingleGame, CoopGame, BotGame)}
+
+
+class ReplayError(Exception):
+    """Unreadable or inconsistent recording"""
+
+
+def keys_to_mask(keys):
+    """Bitmask of KeyType names, order and duplicates do not affect gameplay"""
+    mask = 0
+    for key in keys:
+        mask |= KEY_BITS.get(key, 0)
+    return mask
+
+
+def mask_to_keys(mask):
+    """KeyType names of a bitmask"""
+    return [name for name, bit in KEY_BITS.items() if mask & bit]
+
+
+def state_hash(game):
+    """Hex SHA-256 of the gameplay state, independent of entity ids and object identity"""
+    digest = hashlib.sha256()
+    update = digest.update
+    update(repr((game.score, game.game_result, game.game_clock.now())).encode())
+    for player in game.players.values():
+        update(repr((player.uid, tuple(player.rect), player.health, player.facing.name,
+                     player.last_shot_time)).encode())
+    for npc in game.npcs:
+        update(repr((type(npc).__name__, npc.x, npc.y, tuple(npc.rect), npc.health)).encode())
+    for side, store in enumerate((game.player_bullets, game.npc_bullets)):
+        for bullet in store:
+            update(repr((side, tuple(bullet.rect), bullet.dx, bullet.dy, bullet.damage)).encode())
+    return digest.hexdigest()
+
+
+class InputRecorder:
+    """Writes the seed and per-tick inputs of one match.
+
+    Pass it to a game as recorder=; the game loop calls capture_inputs()
+    before simulating, end_tick() with the ms the clock advanced, and
+    finish() when the match is over. The game must run on a FixedClock so
+    time stays the same throughout a tick.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.players = []
+        self.masks = b""
+        self.record = None
+        self.ticks = 0
+
+    def start(self, game):
+        """Writes the header, done on the first captured tick"""
+        if not isinstance(game.game_clock, FixedClock):
+            raise ReplayError("Recording needs a game running on a FixedClock")
+        self.players = list(game.players)
+        self.record = struct.Struct(f"<H{len(self.players)}B")
+        header = json.dumps({
+            "game": type(game).__name__,
+            "players": self.players,
+            "seed": game.seed,
+            "start": game.game_clock.now(),
+            "bullet_engine": game.bullet_engine,
+            "npc_update": game.npc_update,
+            "npc_steering": game.npc_steering,
+        }).encode()
+        self.file = gzip.open(self.path, "wb")
+        self.file.write(MAGIC + LENGTH.pack(len(header)) + header)
+
+    def capture_inputs(self, game):
+        """Remembers the inputs the coming simulate() will consume"""
+        if self.file is None:
+            self.start(game)
+        get_inputs = game.input_manager.get_inputs
+        self.masks = [keys_to_mask(get_inputs(uid)) for uid in self.players]
+
+    def end_tick(self, dt):
+        """Writes the tick once the clock advanced by dt ms"""
+        if self.file is None:
+            return
+        self.file.write(self.record.pack(min(int(dt), END_MARKER - 1), *self.masks))
+        self.ticks += 1
+
+    def finish(self, game):
+        """Writes the final state hash and closes the stream"""
+        if self.file is None:
+            return
+        self.file.write(DT.pack(END_MARKER) + bytes.fromhex(state_hash(game)))
+        self.file.close()
+        self.file = None
+
+
+def read_recording(path):
+    """(header, [(dt, masks), ...], final hash or None if the match did not finish)"""
+    with gzip.open(path, "rb") as file:
+        data = file.read()
+    if data[:4] != MAGIC:
+        raise ReplayError(f"{path} is not a recording")
+    length = LENGTH.unpack_from(data, 4)[0]
+    offset = 8 + length
+    header = json.loads(data[8:offset])
+    record = struct.Struct(f"<H{len(header['players'])}B")
+
+    ticks = []
+    final_hash = None
+    while offset + DT.size <= len(data):
+        if DT.unpack_from(data, offset)[0] == END_MARKER:
+            final_hash = data[offset + DT.size:offset + DT.size + 32].hex()
+            break
+        dt, *masks = record.unpack_from(data, offset)
+        ticks.append((dt, masks))
+        offset += record.size
+    return header, ticks, final_hash
+
+
+def create_game(header, **kwargs):
+    """Headless game set up like the recorded one"""
+    game_cls = GAME_TYPES.get(header["game"])
+    if game_cls is None:
+        raise ReplayError(f"Unknown game type {header['game']}")
+    if game_cls is BotGame:
+        kwargs["player_count"] = len(header["players"])
+    for name in ("npc_update", "npc_steering"):
+        if name in header:
+            kwargs.setdefault(name, header[name])
+    return game_cls(screen=headless_screen(), clock=FixedClock(header["start"]),
+                    seed=header["seed"], bullet_engine=header["bullet_engine"], **kwargs)
+
+
+def replay(path, render_every=0, **game_kwargs):
+    """Re-runs a recording as fast as possible, returns stats and hash check"""
+    header, ticks, recorded_hash = read_recording(path)
+    game = create_game(header, **game_kwargs)
+    if list(game.players) != header["players"]:
+        raise ReplayError("Player uids differ from the recording")
+
+    add_inputs = game.input_manager.add_inputs
+    players = header["players"]
+    start = time.perf_counter()
+    for tick, (dt, masks) in enumerate(ticks):
+        for uid, mask in zip(players, masks):
+            if mask:
+                add_inputs(uid, mask_to_keys(mask))
+        game.simulate()
+        if render_every and tick % render_every == 0:
+            game.render_all()
+        game.game_clock.advance(dt)
+        game.resolve()
+        game.end_frame()
+    elapsed = time.perf_counter() - start
+
+    final_hash = state_hash(game)
+    return {
+        "ticks": len(ticks),
+        "seconds": elapsed,
+        "ticks_per_second": len(ticks) / elapsed if elapsed else float("inf"),
+        "result": game.game_result,
+        "score": game.score,
+        "hash": final_hash,
+        "recorded_hash": recorded_hash,
+        "match": recorded_hash is None or final_hash == recorded_hash,
+    }
+
+
+def main():
+    """Replay CLI, exits non-zero when the final state differs from the recording"""
+    parser = argparse.ArgumentParser(description="Replay a recorded match headless")
+    parser.add_argument("path")
+    parser.add_argument("--render-every", type=int, default=0)
+    args = parser.parse_args()
+
+    stats = replay(args.path, render_every=args.render_every)
+    print(f"{stats['ticks']} ticks in {stats['seconds']:.2f} s "
+          f"({stats['ticks_per_second']:.0f} ticks/s), result={stats['result']} "
+          f"score={stats['score']}")
+    if stats["recorded_hash"] is None:
+        print(f"final state {stats['hash'][:16]} (recording has no final hash)")
+    elif stats["match"]:
+        print(f"final state {stats['hash'][:16]} matches the recording")
+    else:
+        print(f"MISMATCH: final state {stats['hash'][:16]}, "
+              f"recorded {stats['recorded_hash'][:16]}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
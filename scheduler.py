@@ -0,0 +1,103 @@
+"""Timer scheduling module"""
+import heapq
+import itertools
+
+
+class Timer:
+    """Handle of one scheduled callback"""
+    __slots__ = ("deadline", "callback", "args", "owner", "cancelled")
+
+    def __init__(self, deadline, callback, args, owner):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.owner = owner
+        self.cancelled = False
+
+
+class Scheduler:
+    """Min-heap of deadlines in game clock ms.
+
+    run_due() fires callbacks whose deadline has passed, in deadline order
+    and FIFO among equal deadlines; everything else costs nothing per tick.
+    Timers registered with an owner are cancelled together through
+    cancel_owner(), e.g. when the owning entity dies. Cancelled timers stay
+    in the heap until popped or compacted away.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.order = itertools.count()
+        self.owners = {}  # owner -> set of its live timers
+        self.cancelled = 0
+        self.fired = 0
+
+    def __len__(self):
+        return len(self.heap) - self.cancelled
+
+    def call_at(self, deadline, callback, *args, owner=None):
+        """Runs callback(*args) once the clock reaches deadline"""
+        timer = Timer(deadline, callback, args, owner)
+        heapq.heappush(self.heap, (deadline, next(self.order), timer))
+        if owner is not None:
+            timers = self.owners.get(owner)
+            if timers is None:
+                self.owners[owner] = {timer}
+            else:
+                timers.add(timer)
+        return timer
+
+    def cancel(self, timer):
+        """Stops a pending timer, no-op when it already fired or was cancelled"""
+        if timer.cancelled or timer.callback is None:
+            return
+        timer.cancelled = True
+        self.cancelled += 1
+        if timer.owner is not None:
+            timers = self.owners.get(timer.owner)
+            if timers is not None:
+                timers.discard(timer)
+                if not timers:
+                    del self.owners[timer.owner]
+        self._maybe_compact()
+
+    def cancel_owner(self, owner):
+        """Stops every pending timer of owner"""
+        timers = self.owners.pop(owner, None)
+        if not timers:
+            return
+        for timer in timers:
+            timer.cancelled = True
+        self.cancelled += len(timers)
+        self._maybe_compact()
+
+    def run_due(self, now):
+        """Fires every timer due at now, including ones scheduled by fired callbacks"""
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)[2]
+            if timer.cancelled:
+                self.cancelled -= 1
+                continue
+            callback, args = timer.callback, timer.args
+            timer.callback = timer.args = None  # marks it fired
+            if timer.owner is not None:
+                timers = self.owners.get(timer.owner)
+                if timers is not None:
+                    timers.discard(timer)
+                    if not timers:
+                        del self.owners[timer.owner]
+            self.fired += 1
+            callback(*args)
+
+    def clear(self):
+        """Drops all timers"""
+        self.heap.clear()
+        self.owners.clear()
+        self.cancelled = 0
+
+    def _maybe_compact(self):
+        if self.cancelled > 64 and self.cancelled * 2 > len(self.heap):
+            self.heap = [entry for entry in self.heap if not entry[2].cancelled]
+            heapq.heapify(self.heap)
+            self.cancelled = 0
@@ -0,0 +1,267 @@
+"""Authoritative co-op game server module"""
+import argparse
+import asyncio
+import time
+
+from assets import Assets
+from config import GAME_FPS, CLIENT_REFRESH_COEF, SERVER_SEND_QUEUE
+from game import AbstractGame
+from game_clock import FixedClock
+from headless import headless_screen
+from player import Player
+import protocol
+import snapshot
+
+
+class NetworkGame(AbstractGame):
+    """Game whose players join and leave at runtime, inputs come from the network"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.assets = Assets()
+
+    def add_player(self, uid):
+        """Spawns a player for a newly connected client"""
+        player = Player(uid, assets=self.assets, clock=self.game_clock)
+        offset = (len(self.players) % 8 - 4) * 30
+        player.set_coords(self.screen.get_width() // 2 + offset, self.screen.get_height() // 2)
+        self.players[uid] = player
+        if not self.npcs:
+            self.spawn_random_npc()
+        return player
+
+    def remove_player(self, uid):
+        """Removes player of a disconnected client"""
+        self.players.pop(uid, None)
+        self.input_manager.clear_inputs(uid)
+
+    def handle_key_events(self):
+        """Inputs arrive through InputManager.add_inputs"""
+
+    def check_game_end(self):
+        # An empty server waits for players instead of losing
+        if self.players:
+            super().check_game_end()
+
+
+class ClientConnection:
+    """One connected client with a bounded queue of outgoing frames.
+
+    A slow client never blocks the tick: when its queue is full the oldest
+    state frame is dropped in favour of the newest one.
+    """
+
+    def __init__(self, uid, reader, writer, queue_size=SERVER_SEND_QUEUE):
+        self.uid = uid
+        self.reader = reader
+        self.writer = writer
+        self.queue = asyncio.Queue(queue_size)
+        self.dropped = 0
+        self.acked = 0  # tick of the last snapshot the client decoded
+
+    def send(self, frame):
+        """Queues a frame without waiting"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(frame)
+
+    def close(self):
+        """Stops the write loop once already queued frames are written"""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def write_loop(self):
+        """Writes queued frames until a None sentinel arrives"""
+        while True:
+            frame = await self.queue.get()
+            if frame is None:
+                break
+            self.writer.write(frame)
+            await self.writer.drain()
+
+
+class GameServer:
+    """Runs a NetworkGame on a fixed tick and serves clients over TCP"""
+
+    def __init__(self, host="127.0.0.1", port=8765, fps=GAME_FPS,
+                 refresh_coef=CLIENT_REFRESH_COEF):
+        self.host = host
+        self.port = port
+        self.dt = 1000 // fps
+        self.refresh_coef = max(1, refresh_coef)
+        self.clock = FixedClock()
+        self.game = self.new_game()
+        self.clients = {}
+        self.next_uid = 1
+        self.tick = 0
+        self.running = False
+        self.server = None
+        self.tick_seconds = 0.0
+        self.cpu_seconds = 0.0  # CPU time of this session's ticks, excludes other sessions
+        self.late_ticks = 0
+        self.history = snapshot.SnapshotHistory()
+        self.states_sent = 0
+        self.state_bytes = 0
+
+    def new_game(self):
+        """Fresh game on the server clock"""
+        return NetworkGame(screen=headless_screen(), clock=self.clock)
+
+    async def start(self):
+        """Starts listening, returns the bound port"""
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.running = True
+        return self.port
+
+    async def stop(self):
+        """Stops ticking, disconnects everyone"""
+        self.running = False
+        for client in list(self.clients.values()):
+            client.send(protocol.encode_frame(protocol.BYE))
+            client.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        """Handshake, then feeds client inputs into the game until disconnect"""
+        client = None
+        writer_task = None
+        try:
+            kind, payload = await protocol.read_frame(reader)
+            if kind != protocol.HELLO:
+                raise protocol.ProtocolError("Expected HELLO")
+            name = protocol.parse_hello(payload)
+            uid = f"{name}#{self.next_uid}"
+            self.next_uid += 1
+
+            client = ClientConnection(uid, reader, writer)
+            self.clients[uid] = client
+            player = self.game.add_player(uid)
+            client.send(protocol.encode_json(protocol.WELCOME, {
+                "uid": uid, "id": player.eid, "fps": 1000 // self.dt}))
+            writer_task = asyncio.create_task(client.write_loop())
+
+            while self.running:
+                kind, payload = await protocol.read_frame(reader)
+                if kind == protocol.INPUT:
+                    self.game.input_manager.add_inputs(uid, protocol.parse_inputs(payload))
+                elif kind == protocol.ACK:
+                    client.acked = max(client.acked, protocol.parse_ack(payload))
+                elif kind == protocol.BYE:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, protocol.ProtocolError):
+            pass
+        finally:
+            if client is not None:
+                self.clients.pop(client.uid, None)
+                self.game.remove_player(client.uid)
+                client.close()
+            if writer_task is not None:
+                await asyncio.gather(writer_task, return_exceptions=True)
+            writer.close()
+
+    def step(self):
+        """One simulation tick plus broadcast, never awaits"""
+        game = self.game
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        game.simulate()
+        self.clock.advance(self.dt)
+        game.resolve()
+        game.end_frame()
+        self.tick += 1
+
+        if self.tick % self.refresh_coef == 0 or not game.running:
+            self.broadcast_state(snapshot.capture(game, self.tick))
+
+        if not game.running:
+            self.restart()
+        self.tick_seconds += time.perf_counter() - start
+        self.cpu_seconds += time.thread_time() - cpu_start
+
+    def restart(self):
+        """Match over, everyone still connected joins the next one"""
+        self.game = self.new_game()
+        for uid in self.clients:
+            self.game.add_player(uid)
+
+    def broadcast(self, frame):
+        """Queues one encoded frame for every client"""
+        for client in self.clients.values():
+            client.send(frame)
+
+    def broadcast_state(self, state):
+        """Sends every client a delta against the last snapshot it acknowledged"""
+        self.history.add(state)
+        frames = {}  # clients acknowledging the same tick share one encoded frame
+        for client in self.clients.values():
+            base = self.history.get(client.acked)
+            key = base.tick if base is not None else 0
+            frame = frames.get(key)
+            if frame is None:
+                frame = frames[key] = protocol.encode_frame(
+                    protocol.STATE, snapshot.encode(state, base))
+            client.send(frame)
+            self.states_sent += 1
+            self.state_bytes += len(frame)
+
+    async def run(self, max_ticks=None):
+        """Fixed-rate tick loop, catches up by skipping sleep when behind"""
+        loop = asyncio.get_running_loop()
+        interval = self.dt / 1000
+        next_tick = loop.time()
+        while self.running and (max_ticks is None or self.tick < max_ticks):
+            self.step()
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                self.late_ticks += 1
+                if delay < -interval * 5:
+                    next_tick = loop.time()  # too far behind, drop the backlog
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def stats(self):
+        """Tick and connection statistics"""
+        return {
+            "ticks": self.tick,
+            "clients": len(self.clients),
+            "avg_tick_ms": self.tick_seconds / self.tick * 1e3 if self.tick else 0.0,
+            "cpu_ms_per_tick": self.cpu_seconds / self.tick * 1e3 if self.tick else 0.0,
+            "late_ticks": self.late_ticks,
+            "avg_state_bytes": self.state_bytes / self.states_sent if self.states_sent else 0.0,
+            "dropped_frames": sum(client.dropped for client in self.clients.values()),
+        }
+
+
+async def serve(host, port, max_ticks=None):
+    """Runs a server until interrupted or max_ticks"""
+    server = GameServer(host, port)
+    await server.start()
+    print(f"Serving on {server.host}:{server.port}")
+    try:
+        await server.run(max_ticks)
+    finally:
+        print(server.stats())
+        await server.stop()
+
+
+def main():
+    """Server CLI"""
+    parser = argparse.ArgumentParser(description="Authoritative co-op game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--ticks", type=int, default=None, help="stop after this many ticks")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.ticks))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
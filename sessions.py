@@ -0,0 +1,203 @@
+"""Multi-session hosting module
+
+A SessionManager runs many independent GameServer sessions on one asyncio
+loop, each with its own fixed-rate tick task. One process uses at most one
+core, host_pool() spreads managers over a process pool to use more.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import itertools
+import os
+import time
+
+from config import GAME_FPS, SESSION_MAX, SESSION_CPU_BUDGET
+from headless import RandomBot
+from server import GameServer
+
+
+class BotSession(GameServer):
+    """Session played by local bots instead of network clients, for capacity tests"""
+
+    def __init__(self, bots=2, seed=None, **kwargs):
+        self.bot_uids = [f"bot#{index + 1}" for index in range(bots)]
+        self.bot = RandomBot(seed)
+        self.running = False
+        super().__init__(**kwargs)
+
+    def new_game(self):
+        game = super().new_game()
+        for uid in self.bot_uids:
+            game.add_player(uid)
+        return game
+
+    async def start(self):
+        """Nothing to listen on, just marks the session running"""
+        self.running = True
+        return None
+
+    def step(self):
+        self.bot(self.game, self.tick)
+        super().step()
+
+
+class SessionManager:
+    """Hosts sessions on the running event loop with admission control.
+
+    A session's load is the share of one core its ticks use, measured as
+    thread CPU time per tick times the tick rate. The process load also
+    counts event loop and socket overhead, sampled every monitor_interval.
+    A new session is refused when the manager is full or the larger of both
+    loads, scaled by one more session, would exceed cpu_budget.
+    """
+
+    def __init__(self, max_sessions=SESSION_MAX, cpu_budget=SESSION_CPU_BUDGET, fps=GAME_FPS,
+                 monitor_interval=0.5):
+        self.max_sessions = max_sessions
+        self.cpu_budget = cpu_budget
+        self.fps = fps
+        self.sessions = {}
+        self.tasks = {}
+        self.ids = itertools.count(1)
+        self.rejected = 0
+        self.monitor_interval = monitor_interval
+        self.monitor = None
+        self.process_load = 0.0
+
+    def session_load(self, session):
+        """Share of one core used by a session's ticks so far"""
+        if not session.tick:
+            return 0.0
+        return session.cpu_seconds / session.tick * self.fps
+
+    def load(self):
+        """Share of one core used by all sessions"""
+        return sum(self.session_load(session) for session in self.sessions.values())
+
+    async def monitor_loop(self):
+        """Samples the share of one core the whole process used recently"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        while True:
+            await asyncio.sleep(self.monitor_interval)
+            now_wall, now_cpu = time.perf_counter(), time.process_time()
+            self.process_load = (now_cpu - cpu) / (now_wall - wall)
+            wall, cpu = now_wall, now_cpu
+
+    def can_admit(self):
+        """Whether one more session fits, estimated with the mean load per session"""
+        count = len(self.sessions)
+        if count >= self.max_sessions:
+            return False
+        if not count:
+            return True
+        load = max(self.load(), self.process_load)
+        return load * (count + 1) / count <= self.cpu_budget
+
+    async def open(self, session):
+        """Starts ticking session, returns its id or None when refused"""
+        if not self.can_admit():
+            self.rejected += 1
+            return None
+        if self.monitor is None:
+            self.monitor = asyncio.create_task(self.monitor_loop())
+        session_id = next(self.ids)
+        await session.start()
+        self.sessions[session_id] = session
+        self.tasks[session_id] = asyncio.create_task(session.run())
+        return session_id
+
+    async def close(self, session_id):
+        """Stops one session and waits for its tick task"""
+        session = self.sessions.pop(session_id, None)
+        task = self.tasks.pop(session_id, None)
+        if session is None:
+            return
+        await session.stop()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def close_all(self):
+        """Stops every session"""
+        for session_id in list(self.sessions):
+            await self.close(session_id)
+        if self.monitor is not None:
+            self.monitor.cancel()
+            await asyncio.gather(self.monitor, return_exceptions=True)
+            self.monitor = None
+
+    def metrics(self):
+        """Per-session CPU accounting and process-wide capacity figures"""
+        sessions = {
+            session_id: {
+                "ticks": session.tick,
+                "cpu_ms_per_tick": (session.cpu_seconds / session.tick * 1e3
+                                    if session.tick else 0.0),
+                "load": self.session_load(session),
+                "late_ratio": session.late_ticks / session.tick if session.tick else 0.0,
+            }
+            for session_id, session in self.sessions.items()
+        }
+        load = max(self.load(), self.process_load)
+        return {
+            "pid": os.getpid(),
+            "sessions": len(self.sessions),
+            "rejected": self.rejected,
+            "session_load": self.load(),
+            "process_load": self.process_load,
+            "late_ratio": (sum(s["late_ratio"] for s in sessions.values()) / len(sessions)
+                           if sessions else 0.0),
+            "sessions_per_core": len(sessions) / load if load else 0.0,
+            "per_session": sessions,
+        }
+
+
+async def host_bot_sessions(sessions, seconds, bots=2, seed=0, **manager_kwargs):
+    """Opens up to sessions bot sessions one by one, runs them, returns manager metrics"""
+    manager = SessionManager(**manager_kwargs)
+    try:
+        for index in range(sessions):
+            if await manager.open(BotSession(bots=bots, seed=seed + index)) is None:
+                break
+            # Let the new session tick so admission sees its load
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(seconds)
+        return manager.metrics()
+    finally:
+        await manager.close_all()
+
+
+def _worker(sessions, seconds, bots, seed, manager_kwargs):
+    return asyncio.run(host_bot_sessions(sessions, seconds, bots, seed, **manager_kwargs))
+
+
+def host_pool(workers, sessions, seconds, bots=2, **manager_kwargs):
+    """Runs one SessionManager per worker process, returns their metrics"""
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_worker, sessions, seconds, bots, index * 1000, manager_kwargs)
+                   for index in range(workers)]
+        return [future.result() for future in futures]
+
+
+def main():
+    """Session hosting CLI, reports how many 50 FPS sessions a core sustains"""
+    parser = argparse.ArgumentParser(description="Host many bot sessions per process")
+    parser.add_argument("--workers", type=int, default=1, help="processes, one core each")
+    parser.add_argument("--sessions", type=int, default=SESSION_MAX,
+                        help="sessions to try to open per worker")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--bots", type=int, default=2, help="players per session")
+    parser.add_argument("--budget", type=float, default=SESSION_CPU_BUDGET)
+    args = parser.parse_args()
+
+    results = host_pool(args.workers, args.sessions, args.seconds, args.bots,
+                        max_sessions=args.sessions, cpu_budget=args.budget)
+    for result in results:
+        print(f"pid {result['pid']}: {result['sessions']} sessions "
+              f"({result['rejected']} rejected), session load {result['session_load']:.2f}, "
+              f"process load {result['process_load']:.2f}, late ticks {result['late_ratio']:.1%}, "
+              f"{result['sessions_per_core']:.1f} sessions/core")
+    total = sum(result["sessions"] for result in results)
+    print(f"{total} sessions on {len(results)} cores at {GAME_FPS} FPS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Binary world snapshot module
+
+A snapshot maps the entity id of every player, npc and bullet to its fields
+quantized to fixed-width integers. Frames are little-endian:
+
+    header    tick u32, base tick u32 (0 for a full snapshot), score i32,
+              result u8, then changed, moved and removed counts u32 per section
+    sections  players, npcs, bullets, each as its changed records, its moved
+              records and the u32 ids removed since the base snapshot
+
+A delta frame only carries what differs from the base snapshot the receiver
+last acknowledged, decode() applies it on top of that base. Entities whose
+only change is a small step of x / y go as 6 byte moved records.
+"""
+import struct
+from collections import OrderedDict
+
+from config import MAX_SPRITES
+from enums import Facing
+
+HEADER = struct.Struct("<IIiB9I")
+ID = struct.Struct("<I")
+MOVED = struct.Struct("<Ibb")  # id, dx, dy against the base record
+SECTIONS = ("players", "npcs", "bullets")
+RECORDS = (  # every record starts with id, x, y
+    struct.Struct("<Ihhhb"),  # player: id, x, y, health, facing
+    struct.Struct("<IhhBh"),  # npc: id, x, y, type, health
+    struct.Struct("<IhhbB"),  # bullet: id, x, y, side (0 player, 1 npc), sprite index + 1
+)
+if MAX_SPRITES > 0xFF:
+    raise ValueError("MAX_SPRITES must fit the one byte sprite field of bullet records")
+
+RESULTS = (None, "win", "lost")
+RESULT_CODES = {result: code for code, result in enumerate(RESULTS)}
+FACING_CODES = {facing: code for code, facing in enumerate(Facing)}
+I16_MIN, I16_MAX = -(1 << 15), (1 << 15) - 1
+
+
+class SnapshotError(Exception):
+    """Frame that does not fit the available base snapshot"""
+
+
+class Snapshot:
+    """World state of one tick, sections map entity id -> tuple of record fields"""
+    __slots__ = ("tick", "score", "result", "players", "npcs", "bullets")
+
+    def __init__(self, tick, score=0, result=None, players=None, npcs=None, bullets=None):
+        self.tick = tick
+        self.score = score
+        self.result = result
+        self.players = players if players is not None else {}
+        self.npcs = npcs if npcs is not None else {}
+        self.bullets = bullets if bullets is not None else {}
+
+    def sections(self):
+        """(players, npcs, bullets) dicts"""
+        return self.players, self.npcs, self.bullets
+
+    def __eq__(self, other):
+        return (isinstance(other, Snapshot) and self.tick == other.tick and
+                self.score == other.score and self.result == other.result and
+                self.sections() == other.sections())
+
+    def __len__(self):
+        return len(self.players) + len(self.npcs) + len(self.bullets)
+
+
+def _i16(value):
+    return min(I16_MAX, max(I16_MIN, int(value)))
+
+
+def capture(game, tick):
+    """Snapshot of the live game entities"""
+    players = {
+        p.eid: (p.rect.x, p.rect.y, _i16(p.health), FACING_CODES[p.facing])
+        for p in game.players.values()
+    }
+    npcs = {n.eid: (n.rect.x, n.rect.y, n.type_id, _i16(n.health)) for n in game.npcs}
+    bullets = {}
+    for side, store in enumerate((game.player_bullets, game.npc_bullets)):
+        for bullet in store:
+            rect = bullet.rect
+            bullets[bullet.eid] = (rect.x, rect.y, side, bullet.sprite_index + 1)
+    return Snapshot(tick, game.score, game.game_result, players, npcs, bullets)
+
+
+def encode(snapshot, base=None):
+    """Frame bytes of snapshot, a delta against base when given"""
+    if base is not None and not base.tick:
+        raise SnapshotError("Tick 0 marks full snapshots and cannot be a delta base")
+    counts = []
+    chunks = []
+    for record, section, base_section in zip(
+            RECORDS, snapshot.sections(), base.sections() if base is not None else ({},) * 3):
+        changed, moved, removed = [], [], []
+        if base_section:
+            get = base_section.get
+            for eid, fields in section.items():
+                old = get(eid)
+                if old == fields:
+                    continue
+                if old is not None and old[2:] == fields[2:]:
+                    dx, dy = fields[0] - old[0], fields[1] - old[1]
+                    if -128 <= dx <= 127 and -128 <= dy <= 127:
+                        moved.append((eid, dx, dy))
+                        continue
+                changed.append((eid,) + fields)
+            removed = [eid for eid in base_section if eid not in section]
+        else:
+            changed = [(eid,) + fields for eid, fields in section.items()]
+        pack = record.pack
+        chunks.extend(pack(*row) for row in changed)
+        chunks.extend(MOVED.pack(*row) for row in moved)
+        if removed:
+            chunks.append(struct.pack(f"<{len(removed)}I", *removed))
+        counts += (len(changed), len(moved), len(removed))
+
+    header = HEADER.pack(snapshot.tick, base.tick if base is not None else 0,
+                         snapshot.score, RESULT_CODES.get(snapshot.result, 0), *counts)
+    return header + b"".join(chunks)
+
+
+def decode(data, base=None):
+    """Snapshot of frame bytes, base must be the snapshot a delta frame refers to"""
+    data = memoryview(data)
+    tick, base_tick, score, result, *counts = HEADER.unpack_from(data)
+    if base_tick and (base is None or base.tick != base_tick):
+        raise SnapshotError(f"Delta of tick {tick} needs base tick {base_tick}")
+
+    sections = []
+    offset = HEADER.size
+    for index, record in enumerate(RECORDS):
+        changed, moved, removed = counts[3 * index:3 * index + 3]
+        section = dict(base.sections()[index]) if base_tick else {}
+        end = offset + changed * record.size
+        for row in record.iter_unpack(data[offset:end]):
+            section[row[0]] = row[1:]
+        offset = end
+        if moved:
+            end = offset + moved * MOVED.size
+            for eid, dx, dy in MOVED.iter_unpack(data[offset:end]):
+                old = section[eid]
+                section[eid] = (old[0] + dx, old[1] + dy) + old[2:]
+            offset = end
+        if removed:
+            end = offset + removed * ID.size
+            for (eid,) in ID.iter_unpack(data[offset:end]):
+                section.pop(eid, None)
+            offset = end
+        sections.append(section)
+
+    if offset != len(data):
+        raise SnapshotError(f"Frame length {len(data)} does not match its counts")
+    return Snapshot(tick, score, RESULTS[result] if result < len(RESULTS) else None, *sections)
+
+
+class SnapshotHistory:
+    """Most recent snapshots by tick, the candidates for delta bases"""
+
+    def __init__(self, size=64):
+        self.size = size
+        self.snapshots = OrderedDict()
+
+    def add(self, snapshot):
+        """Stores snapshot, forgetting the oldest one when full"""
+        self.snapshots[snapshot.tick] = snapshot
+        while len(self.snapshots) > self.size:
+            self.snapshots.popitem(last=False)
+
+    def get(self, tick):
+        """Snapshot of tick, or None when unknown or already forgotten"""
+        return self.snapshots.get(tick)
+
+    def clear(self):
+        """Forgets all snapshots"""
+        self.snapshots.clear()
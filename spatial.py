@@ -0,0 +1,203 @@
+"""Spatial indexing module"""
+import math
+
+from config import COLLISION_CELL_SIZE, TARGET_CELL_SIZE
+
+# Target count up to which nearest_for_all scans all targets directly
+BRUTE_FORCE_LIMIT = 8
+
+
+class SpatialHash:
+    """Uniform grid broadphase over objects with a pygame.Rect"""
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.objects = []
+
+    def clear(self):
+        """Removes all objects"""
+        self.cells.clear()
+        self.objects.clear()
+
+    def insert(self, obj, rect=None):
+        """Adds one object, indexed by rect or obj.rect"""
+        rect = obj.rect if rect is None else rect
+        index = len(self.objects)
+        self.objects.append((obj, rect))
+        cells = self.cells
+        left, top, right, bottom = self._cell_bounds(rect)
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [index]
+                else:
+                    bucket.append(index)
+
+    def build(self, objects):
+        """Rebuilds the grid from scratch, usually once per tick"""
+        self.clear()
+        for obj in objects:
+            self.insert(obj)
+        return self
+
+    def query(self, rect):
+        """Objects colliding with rect, in insertion order"""
+        cells = self.cells
+        left, top, right, bottom = self._cell_bounds(rect)
+
+        if left == right and top == bottom:
+            candidates = cells.get((left, top), ())
+        else:
+            found = set()
+            for cx in range(left, right + 1):
+                for cy in range(top, bottom + 1):
+                    found.update(cells.get((cx, cy), ()))
+            candidates = sorted(found)
+
+        objects = self.objects
+        hits = []
+        for index in candidates:
+            obj, obj_rect = objects[index]
+            if rect.colliderect(obj_rect):
+                hits.append(obj)
+        return hits
+
+    def _cell_bounds(self, rect):
+        size = self.cell_size
+        left, top = rect.left // size, rect.top // size
+        right = max(left, (rect.right - 1) // size)
+        bottom = max(top, (rect.bottom - 1) // size)
+        return left, top, right, bottom
+
+    def pairs(self, group):
+        """All overlapping (item, obj) pairs between group and indexed objects"""
+        for item in group:
+            for obj in self.query(item.rect):
+                yield item, obj
+
+
+def overlapping_pairs(group_a, group_b, cell_size=COLLISION_CELL_SIZE):
+    """All overlapping (a, b) pairs between two groups of objects with rect"""
+    return SpatialHash(cell_size).build(group_b).pairs(group_a)
+
+
+class TargetIndex:
+    """Grid buckets over object centers for nearest and radius queries"""
+
+    def __init__(self, cell_size=TARGET_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.objects = []
+        self.bounds = None
+
+    def build(self, objects):
+        """Indexes objects by their rect centers, usually once per tick"""
+        size = self.cell_size
+        self.cells = cells = {}
+        self.objects = entries = []
+        for order, obj in enumerate(objects):
+            x, y = obj.rect.center
+            entries.append((x, y, order, obj))
+            key = (x // size, y // size)
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [order]
+            else:
+                bucket.append(order)
+
+        if cells:
+            xs = [key[0] for key in cells]
+            ys = [key[1] for key in cells]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+        else:
+            self.bounds = None
+        return self
+
+    def __len__(self):
+        return len(self.objects)
+
+    def _ring(self, cx, cy, radius):
+        if radius == 0:
+            yield cx, cy
+            return
+        for x in range(cx - radius, cx + radius + 1):
+            yield x, cy - radius
+            yield x, cy + radius
+        for y in range(cy - radius + 1, cy + radius):
+            yield cx - radius, y
+            yield cx + radius, y
+
+    def nearest(self, x, y, k=1):
+        """Up to k closest objects to (x, y), closest first"""
+        if not self.objects or k <= 0:
+            return []
+        if len(self.objects) <= k:
+            return [obj for _, _, obj in sorted(self._distances(x, y, range(len(self.objects))))]
+
+        size = self.cell_size
+        cx, cy = x // size, y // size
+        min_x, min_y, max_x, max_y = self.bounds
+        max_radius = max(cx - min_x, max_x - cx, cy - min_y, max_y - cy)
+
+        found = []
+        for radius in range(max_radius + 1):
+            for key in self._ring(cx, cy, radius):
+                bucket = self.cells.get(key)
+                if bucket:
+                    found.extend(self._distances(x, y, bucket))
+            # Every object in further rings is at least radius cells away
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= radius * size:
+                    break
+        found.sort()
+        return [obj for _, _, obj in found[:k]]
+
+    def nearest_one(self, x, y):
+        """Closest object to (x, y) or None"""
+        found = self.nearest(x, y, 1)
+        return found[0] if found else None
+
+    def within_radius(self, x, y, radius):
+        """Objects with center within radius of (x, y), closest first"""
+        size = self.cell_size
+        found = []
+        for cx in range(int(x - radius) // size, int(x + radius) // size + 1):
+            for cy in range(int(y - radius) // size, int(y + radius) // size + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    found.extend(item for item in self._distances(x, y, bucket)
+                                 if item[0] <= radius)
+        found.sort()
+        return [obj for _, _, obj in found]
+
+    def nearest_for_all(self, sources):
+        """Closest object for every source (by rect center) in one pass"""
+        if not self.objects:
+            return [None] * len(sources)
+
+        if len(self.objects) > BRUTE_FORCE_LIMIT:
+            return [self.nearest_one(*source.rect.center) for source in sources]
+
+        # Few targets (usually players), a flat scan beats walking the grid
+        entries = self.objects
+        result = []
+        for source in sources:
+            sx, sy = source.rect.center
+            best = None
+            best_dist = float("inf")
+            for x, y, _, obj in entries:
+                dist = (x - sx) * (x - sx) + (y - sy) * (y - sy)
+                if dist < best_dist:
+                    best_dist = dist
+                    best = obj
+            result.append(best)
+        return result
+
+    def _distances(self, x, y, orders):
+        entries = self.objects
+        for order in orders:
+            ox, oy, _, obj = entries[order]
+            yield math.hypot(ox - x, oy - y), order, obj
@@ -1,34 +1,20 @@
 import pygame
+from asset_cache import ASSET_CACHE
 
 class SpriteSheet:
     def __init__(self, filename):
-        self.sheet = pygame.image.load(filename).convert_alpha()
+        self.filename = filename
+
+    @property
+    def sheet(self):
+        # Decoded on first use only, load_grid() frames may come pre-cut from the atlas
+        return ASSET_CACHE.image(self.filename)
 
     def get_image(self, x, y, width, height):
         image = pygame.Surface((width, height), pygame.SRCALPHA)
         image.blit(self.sheet, (0, 0), (x, y, width, height))
         return image
-        
-    def load_grid(self, cols, rows, scale=1.0):
-        grid = []
-        frame_width = self.sheet.get_width() // cols
-        frame_height = self.sheet.get_height() // rows
 
-        for row in range(rows):
-            row_frames = []
-            for col in range(cols):
-                frame = self.get_image(
-                    col * frame_width,
-                    row * frame_height,
-                    frame_width,
-                    frame_height
-                )
-                if scale != 1.0:
-                    frame = pygame.transform.scale(
-                        frame,
-                        (int(frame_width * scale), int(frame_height * scale))
-                    )
-                row_frames.append(frame)
-            grid.append(row_frames)
-
-        return grid  # 2D grid[row][col]
+    def load_grid(self, cols, rows, scale=1.0):
+        # Frames are shared through the asset cache, do not modify them
+        return ASSET_CACHE.grid(self.filename, cols, rows, scale)  # 2D grid[row][col]
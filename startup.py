@@ -0,0 +1,106 @@
+"""Startup time profiling module
+
+Standard library only, so main.py can import it first and time everything
+imported after it, pygame included.
+"""
+import builtins
+import contextlib
+import os
+import sys
+import time
+
+NULL_STEP = contextlib.nullcontext()
+
+
+def process_age():
+    """Seconds since the process was started, None where /proc is unavailable"""
+    try:
+        with open("/proc/self/stat", encoding="ascii") as f:
+            # Fields after the parenthesized command name, starttime is field 22
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+class _Step:
+    """Context manager recording the duration of one startup step"""
+    __slots__ = ("profile", "name", "start", "modules")
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+        self.start = 0.0
+        self.modules = 0
+
+    def __enter__(self):
+        self.modules = len(sys.modules)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.profile.steps.append((self.name, elapsed, len(sys.modules) - self.modules))
+        return False
+
+
+class StartupProfile:
+    """Wall time breakdown from process start to the first rendered frame.
+
+    While enabled, every import statement executed directly by the watched
+    module is timed as its own step, nested imports count towards it.
+    Disabled profiles time nothing and step() blocks run untouched.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.created = time.perf_counter()
+        self.boot = process_age() if enabled else None  # interpreter startup before main.py
+        self.steps = []  # (name, seconds, modules imported)
+        self._import = None
+
+    def step(self, name):
+        """Context manager timing one step"""
+        if not self.enabled:
+            return NULL_STEP
+        return _Step(self, name)
+
+    def watch_imports(self, module_name):
+        """Times imports executed at the top level of module_name until stop_imports()"""
+        if not self.enabled or self._import is not None:
+            return
+        original = self._import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):  # pylint: disable=redefined-builtin
+            if globals is None or globals.get("__name__") != module_name:
+                return original(name, globals, locals, fromlist, level)
+            label = "import " + (name if not fromlist else f"{name} ({', '.join(fromlist)})")
+            with self.step(label):
+                return original(name, globals, locals, fromlist, level)
+
+        builtins.__import__ = timed_import
+
+    def stop_imports(self):
+        """Restores the regular import machinery"""
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    def report(self):
+        """Text lines with every step and the total"""
+        self.stop_imports()
+        lines = [f"{'startup step':<48}{'ms':>9}{'modules':>9}"]
+        total = time.perf_counter() - self.created
+        if self.boot is not None:
+            lines.append(f"{'python interpreter startup':<48}{self.boot * 1e3:>9.1f}{'':>9}")
+            total += self.boot
+        accounted = 0.0
+        for name, seconds, modules in self.steps:
+            accounted += seconds
+            lines.append(f"{name[:47]:<48}{seconds * 1e3:>9.1f}{modules or '':>9}")
+        other = total - accounted - (self.boot or 0.0)
+        lines.append(f"{'other':<48}{other * 1e3:>9.1f}{'':>9}")
+        lines.append(f"{'total to first frame':<48}{total * 1e3:>9.1f}{len(sys.modules):>9}")
+        return lines
@@ -0,0 +1,53 @@
+"""Text rendering cache module"""
+from collections import OrderedDict
+
+import pygame
+
+from config import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """Shared fonts and LRU cache of rendered text Surfaces"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, name=None, size=24):
+        """Font by system name (None for the default font), created once"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(None, size) if name is None else pygame.font.SysFont(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, antialias=True, font=None):
+        """Rendered text Surface, shared between callers so do not modify it"""
+        key = (font, size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(font, size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drops all rendered Surfaces"""
+        self.surfaces.clear()
+
+    def stats(self):
+        """Hit / miss counters and number of cached Surfaces"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.surfaces)}
+
+
+TEXT_CACHE = TextCache()
@@ -2,26 +2,49 @@
 import os
 
 import pygame
+from asset_cache import ASSET_CACHE
 from decorators import log_decorator
 from enums import GameType
+from text_cache import TEXT_CACHE
+
+PROGRESS_HEIGHT = 6
+UI_FPS = 30
+
+
+def draw_progress(screen, progress, color=(255, 255, 255), background=(0, 0, 0)):
+    """Loading bar along the bottom edge of the screen, returns its area"""
+    width, height = screen.get_size()
+    area = pygame.Rect(0, height - PROGRESS_HEIGHT, width, PROGRESS_HEIGHT)
+    screen.fill(background, area)
+    screen.fill(color, (0, area.top, int(width * progress), PROGRESS_HEIGHT))
+    return area
+
+
+def update_progress(screen, preloader, **colors):
+    """Lets the preloader hand over finished assets and redraws its bar"""
+    if preloader is None or preloader.ready:
+        return
+    pygame.display.update(draw_progress(screen, preloader.poll(), **colors))
 
 
 @log_decorator
-def show_menu(screen):
-    """Main game menu"""
-    font = pygame.font.Font(None, 36)
+def show_menu(screen, preloader=None):
+    """Main game menu, keeps showing preloader progress"""
     menu_options = ["1: Single player game",
                     "2: Cooperative game",
                     "ESC: Ukončení"]
 
     screen.fill((43, 28, 88))
     for i, option in enumerate(menu_options):
-        text = font.render(option, True, (255, 255, 255))
+        text = TEXT_CACHE.render(option, 36, (255, 255, 255))
         screen.blit(text, (270, 320 + i * 40))
 
     pygame.display.flip()
 
+    clock = pygame.time.Clock()
     while True:
+        update_progress(screen, preloader, background=(43, 28, 88))
+        clock.tick(UI_FPS)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -37,17 +60,24 @@ def show_menu(screen):
                 if event.key == pygame.K_ESCAPE:
                     return "quit"
 
-def show_splash(screen):
-    """Init splash screen"""
-
+def draw_splash(screen):
+    """Draws and shows the splash screen"""
     bg_path = os.path.join("assets", "sprites", "background", "intro.png")
-    background = pygame.image.load(bg_path).convert()
-    background = pygame.transform.scale(background, screen.get_size())
+    background = ASSET_CACHE.image(bg_path, size=screen.get_size(), alpha=False)
 
     screen.blit(background, (0, 0))
     pygame.display.flip()
 
+
+def show_splash(screen, preloader=None, drawn=False):
+    """Init splash screen, shows preloader progress while assets load"""
+    if not drawn:
+        draw_splash(screen)
+
+    clock = pygame.time.Clock()
     while True:
+        update_progress(screen, preloader)
+        clock.tick(UI_FPS)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -57,8 +87,7 @@ def show_splash(screen):
                 return
 
 def show_end_message(screen, message):
-    font = pygame.font.SysFont(None, 60)
-    text = font.render(message, True, (255, 255, 255))
+    text = TEXT_CACHE.render(message, 60, (255, 255, 255))
     rect = text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
     screen.fill((0, 0, 0))
     screen.blit(text, rect)